@@ -6,6 +6,8 @@ Creates all tables and optionally seeds initial data.
 import sys
 from pathlib import Path
 
+from sqlalchemy import insert
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
@@ -39,10 +41,9 @@ def seed_stocks():
             logger.info(f"Database already has {existing_count} stocks. Skipping seed.")
             return
         
-        # Add stocks
-        for stock_data in initial_stocks:
-            stock = Stock(**stock_data, exchange="NSE", is_active=True)
-            db.add(stock)
+        # Add stocks with a Core executemany insert, batched into multi-row VALUES
+        rows = [{**stock_data, "exchange": "NSE", "is_active": True} for stock_data in initial_stocks]
+        db.execute(insert(Stock), rows)
         
         db.commit()
         logger.info(f"Seeded {len(initial_stocks)} stocks successfully")
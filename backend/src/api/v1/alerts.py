@@ -4,6 +4,7 @@ Manage user-defined stock alerts.
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Body
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
@@ -69,12 +70,13 @@ def list_alerts(
     Returns:
         List of alerts
     """
-    query = db.query(Alert)
+    # Row mappings go straight to the response model (no ORM instances)
+    query = select(Alert.__table__)
     
     if active_only:
-        query = query.filter(Alert.is_active == True)
+        query = query.where(Alert.is_active == True)
     
-    alerts = query.all()
+    alerts = db.execute(query).mappings().all()
     
     return alerts
 
@@ -119,22 +121,26 @@ def update_alert(
     Returns:
         Updated alert
     """
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    update_data = alert_update.model_dump(exclude_unset=True)
+    
+    if update_data:
+        # Single UPDATE ... RETURNING instead of SELECT + dirty-tracked flush
+        alert = db.execute(
+            update(Alert).where(Alert.id == alert_id).values(**update_data).returning(Alert)
+        ).scalar_one_or_none()
+    else:
+        alert = db.get(Alert, alert_id)
     
     if not alert:
         raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
     
-    # Update fields if provided
-    update_data = alert_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(alert, field, value)
-    
+    # Serialize before commit so the expired instance is not reloaded
+    response = AlertResponse.model_validate(alert)
     db.commit()
-    db.refresh(alert)
     
-    logger.info(f"Updated alert: {alert.name} (ID: {alert.id})")
+    logger.info(f"Updated alert: {response.name} (ID: {response.id})")
     
-    return alert
+    return response
 
 
 @router.delete("/{alert_id}", status_code=204)
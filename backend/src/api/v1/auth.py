@@ -1,27 +1,39 @@
 """
 Authorization API routes.
 """
+import orjson
 from datetime import timedelta
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
 from pydantic import BaseModel, EmailStr
 
+from ...core.config import settings
 from ...core.database import get_db
+from ...core.logging import get_logger
+from ...core.redis_client import get_redis
 from ...core.security import (
     verify_password, 
     get_password_hash, 
     create_access_token, 
+    is_login_throttled,
+    record_failed_login,
+    clear_failed_logins,
     SECRET_KEY, 
     ALGORITHM
 )
 from ...models.auth import User
 
+logger = get_logger(__name__)
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Unique index on users.email (SQLAlchemy's ix_<table>_<column> name)
+USER_EMAIL_INDEX = "ix_users_email"
+
 # Shared schemas
 class Token(BaseModel):
     access_token: str
@@ -41,13 +53,40 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
-# Helper to get current user
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)):
+# Cached user lookups per email. Tokens are still decoded on every request, so
+# expiry is enforced; the cache only saves the user query. There are no user
+# edit/deactivate endpoints yet, so staleness is bounded by AUTH_CACHE_TTL_SECONDS.
+def _auth_cache_key(email: str) -> str:
+    return "auth:user:" + email
+
+def _get_cached_user(email: str) -> Optional[User]:
+    try:
+        cached = get_redis().get(_auth_cache_key(email))
+    except Exception as e:
+        logger.warning(f"Auth cache lookup failed: {e}")
+        return None
+    return User(**orjson.loads(cached)) if cached else None
+
+def _cache_user(user: User) -> None:
+    data = {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "is_active": user.is_active,
+    }
+    try:
+        get_redis().set(_auth_cache_key(user.email), orjson.dumps(data), ex=settings.AUTH_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Auth cache store failed: {e}")
+
+# Helper to get current user (sync so FastAPI runs the DB/Redis calls in its threadpool)
+def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -56,41 +95,70 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Se
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user = _get_cached_user(email)
     if user is None:
+        user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            raise credentials_exception
+        _cache_user(user)
+    
+    # Deactivated users are rejected whether or not they came from the cache
+    if not user.is_active:
         raise credentials_exception
     return user
 
 @router.post("/signup", response_model=UserResponse)
 def signup(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
     hashed_password = get_password_hash(user.password)
     new_user = User(
         email=user.email, 
         hashed_password=hashed_password, 
         full_name=user.full_name
     )
+    
+    # Rely on the unique email index instead of a separate existence check
+    # (one round trip, and no race between concurrent signups)
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        constraint = getattr(getattr(e.orig, "diag", None), "constraint_name", None)
+        if constraint != USER_EMAIL_INDEX:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        ) from e
     db.refresh(new_user)
     return new_user
 
 @router.post("/login", response_model=Token)
-def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)):
+def login(
+    request: Request,
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    db: Session = Depends(get_db)
+):
+    client_id = request.client.host if request.client else "unknown"
+    
+    # Reject before bcrypt once a client has too many recent failures
+    if is_login_throttled(client_id):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Try again later.",
+            headers={"Retry-After": str(settings.LOGIN_FAILURE_WINDOW_SECONDS)},
+        )
+    
     user = db.query(User).filter(User.email == form_data.username).first()
     if not user or not verify_password(form_data.password, user.hashed_password):
+        record_failed_login(client_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    clear_failed_logins(client_id)
     access_token = create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -2,14 +2,19 @@
 Screening API endpoints.
 Provides stock screening and ranking functionality.
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Body
+import base64
+from typing import Any, Dict, List, Optional
+import orjson
+from fastapi import APIRouter, Depends, Body, HTTPException, Query
+from fastapi_cache.decorator import cache
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import and_, asc, desc, func, or_, select
 
+from ...core.cache import RANKINGS_NAMESPACE
+from ...core.config import settings
 from ...core.database import get_db
 from ...core.logging import get_logger
-from ...models.database import Stock, Fundamental, CompositeScore
+from ...models.database import Stock, Fundamental, CompositeScore, LatestCompositeScore
 from ...models.schemas import (
     ScreeningFilters,
     ScreeningResponse,
@@ -23,6 +28,53 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encode a screening keyset cursor.
+    
+    Args:
+        payload: Sort key of the last row returned, plus the sort it belongs to
+        
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode()
+
+
+def decode_cursor(cursor: str, filters: ScreeningFilters) -> Dict[str, Any]:
+    """
+    Decode a screening keyset cursor and check it matches the requested sort.
+    
+    Args:
+        cursor: Cursor from a previous ScreeningResponse
+        filters: Screening criteria of the current request
+        
+    Returns:
+        Cursor payload
+    """
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor))
+        valid = (
+            payload["s"] == filters.sort_by
+            and payload["o"] == filters.sort_order
+            and isinstance(payload["id"], int)
+            and isinstance(payload["n"], int)
+            # The sort value is bound into the keyset filter, so only numbers
+            # (or NULL) may come back from the client
+            and (
+                payload["v"] is None
+                or (isinstance(payload["v"], (int, float)) and not isinstance(payload["v"], bool))
+            )
+        )
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid or mismatched cursor")
+    
+    return payload
+
+
 @router.post("/", response_model=ScreeningResponse)
 def screen_stocks(
     filters: ScreeningFilters = Body(...),
@@ -49,17 +101,25 @@ def screen_stocks(
         desc(CompositeScore.score_date)
     ).subquery()
     
+    # Latest fundamental per stock, resolved once as a derived table
+    fundamental_subquery = db.query(
+        Fundamental.stock_id,
+        Fundamental.id.label("fundamental_id")
+    ).distinct(
+        Fundamental.stock_id
+    ).order_by(
+        Fundamental.stock_id,
+        desc(Fundamental.data_date)
+    ).subquery()
+    
     query = db.query(Stock, CompositeScore, Fundamental).join(
         subquery, Stock.id == subquery.c.stock_id
     ).join(
         CompositeScore, CompositeScore.id == subquery.c.score_id
     ).outerjoin(
-        Fundamental, and_(
-            Fundamental.stock_id == Stock.id,
-            Fundamental.id == db.query(Fundamental.id).filter(
-                Fundamental.stock_id == Stock.id
-            ).order_by(desc(Fundamental.data_date)).limit(1).scalar_subquery()
-        )
+        fundamental_subquery, fundamental_subquery.c.stock_id == Stock.id
+    ).outerjoin(
+        Fundamental, Fundamental.id == fundamental_subquery.c.fundamental_id
     ).filter(
         Stock.is_active == True
     )
@@ -83,29 +143,27 @@ def screen_stocks(
     if filters.composite_score_min:
         query = query.filter(CompositeScore.composite_score >= filters.composite_score_min)
     
-    # Fundamental filters (if fundamental data exists)
-    if filters.pe_ratio_min and Fundamental.pe_ratio:
+    # Fundamental filters
+    if filters.pe_ratio_min is not None:
         query = query.filter(Fundamental.pe_ratio >= filters.pe_ratio_min)
     
-    if filters.pe_ratio_max and Fundamental.pe_ratio:
+    if filters.pe_ratio_max is not None:
         query = query.filter(Fundamental.pe_ratio <= filters.pe_ratio_max)
     
-    if filters.pb_ratio_min and Fundamental.pb_ratio:
+    if filters.pb_ratio_min is not None:
         query = query.filter(Fundamental.pb_ratio >= filters.pb_ratio_min)
     
-    if filters.pb_ratio_max and Fundamental.pb_ratio:
+    if filters.pb_ratio_max is not None:
         query = query.filter(Fundamental.pb_ratio <= filters.pb_ratio_max)
     
-    if filters.roe_min and Fundamental.roe:
+    if filters.roe_min is not None:
         query = query.filter(Fundamental.roe >= filters.roe_min)
     
-    if filters.debt_to_equity_max and Fundamental.debt_to_equity:
+    if filters.debt_to_equity_max is not None:
         query = query.filter(Fundamental.debt_to_equity <= filters.debt_to_equity_max)
     
-    # Count total before pagination
-    total_count = query.count()
-    
-    # Apply sorting
+    # Apply sorting; NULLs last and stock ID as tie-breaker give a total order
+    # that a keyset cursor can resume from
     sort_column_map = {
         "composite_score": CompositeScore.composite_score,
         "fundamental_score": CompositeScore.fundamental_score,
@@ -116,35 +174,79 @@ def screen_stocks(
     }
     
     sort_column = sort_column_map.get(filters.sort_by, CompositeScore.composite_score)
+    descending = filters.sort_order == "desc"
+    direction = desc if descending else asc
     
-    if filters.sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(sort_column)
-    
-    # Apply pagination
-    query = query.offset(filters.offset).limit(filters.limit)
+    query = query.add_columns(sort_column.label("sort_value")).order_by(
+        direction(sort_column).nulls_last(),
+        direction(Stock.id)
+    )
     
-    # Execute query
-    results = query.all()
+    if filters.cursor:
+        # Keyset page: seek past the last row of the previous page instead of
+        # scanning and discarding offset rows; the total travels in the cursor
+        after = decode_cursor(filters.cursor, filters)
+        total_count = after["n"]
+        
+        after_id = Stock.id < after["id"] if descending else Stock.id > after["id"]
+        if after["v"] is None:
+            # Already inside the trailing NULL block
+            query = query.filter(sort_column.is_(None), after_id)
+        else:
+            beyond = sort_column < after["v"] if descending else sort_column > after["v"]
+            query = query.filter(or_(
+                beyond,
+                and_(sort_column == after["v"], after_id),
+                sort_column.is_(None)
+            ))
+        
+        results = query.limit(filters.limit).all()
+    else:
+        # Total matches before pagination, computed in the same scan as the page rows
+        filtered_query = query.order_by(None)
+        query = query.add_columns(func.count().over().label("total_count"))
+        
+        results = query.offset(filters.offset).limit(filters.limit).all()
+        
+        if results:
+            total_count = results[0].total_count
+        elif filters.offset:
+            # Page is past the end; the window count is unavailable so count explicitly
+            total_count = filtered_query.count()
+        else:
+            total_count = 0
     
     # Build response
     stocks_with_scores = []
-    for stock, score, fundamental in results:
+    for row in results:
+        stock, score, fundamental = row[:3]
         stocks_with_scores.append({
             "stock": stock,
             "latest_score": score,
             "latest_fundamental": fundamental
         })
     
+    next_cursor = None
+    if len(results) == filters.limit:
+        last = results[-1]
+        next_cursor = encode_cursor({
+            "s": filters.sort_by,
+            "o": filters.sort_order,
+            "v": last.sort_value,
+            "id": last[0].id,
+            "n": total_count
+        })
+    
     return {
         "total_count": total_count,
         "results": stocks_with_scores,
-        "filters_applied": filters
+        "filters_applied": filters,
+        "next_cursor": next_cursor
     }
 
 
 @router.get("/rankings/composite", response_model=List[dict])
+@cache(expire=settings.RANKINGS_CACHE_TTL, namespace=RANKINGS_NAMESPACE)
 def get_composite_rankings(
     limit: int = 50,
     db: Session = Depends(get_db)
@@ -165,9 +267,44 @@ def get_composite_rankings(
     return scorer.get_top_stocks(db=db, limit=limit)
 
 
+def rank_latest_scores(db: Session, score_column, limit: int, offset: int = 0) -> List[dict]:
+    """
+    Rank stocks by a column of their latest composite score.
+    
+    Reads the latest-score materialized view, so no per-request DISTINCT ON.
+    Ranks are computed in SQL, so they stay correct across pages.
+    
+    Args:
+        db: Database session
+        score_column: LatestCompositeScore column to rank by
+        limit: Number of top stocks
+        offset: Number of ranked stocks to skip
+        
+    Returns:
+        Ranked stock score dictionaries
+    """
+    query = select(
+        # Stock ID breaks score ties so ranks and pages stay stable
+        func.row_number().over(order_by=(desc(score_column), Stock.id)).label("rank"),
+        Stock.symbol,
+        Stock.name,
+        LatestCompositeScore.fundamental_score,
+        LatestCompositeScore.sentiment_score,
+        LatestCompositeScore.composite_score
+    ).join(
+        LatestCompositeScore, LatestCompositeScore.stock_id == Stock.id
+    ).order_by(
+        desc(score_column), Stock.id
+    ).offset(offset).limit(limit)
+    
+    return [dict(row) for row in db.execute(query).mappings()]
+
+
 @router.get("/rankings/fundamental", response_model=List[dict])
+@cache(expire=settings.RANKINGS_CACHE_TTL, namespace=RANKINGS_NAMESPACE)
 def get_fundamental_rankings(
     limit: int = 50,
+    offset: int = Query(default=0, ge=0, le=settings.MAX_PAGE_OFFSET),
     db: Session = Depends(get_db)
 ):
     """
@@ -175,46 +312,20 @@ def get_fundamental_rankings(
     
     Args:
         limit: Number of top stocks
+        offset: Number of ranked stocks to skip
         db: Database session
         
     Returns:
         Top stocks by fundamentals
     """
-    # Get latest scores
-    subquery = db.query(
-        CompositeScore.stock_id,
-        CompositeScore.id.label("score_id")
-    ).distinct(
-        CompositeScore.stock_id
-    ).order_by(
-        CompositeScore.stock_id,
-        desc(CompositeScore.score_date)
-    ).limit(1000).subquery()
-    
-    results = db.query(Stock, CompositeScore).join(
-        subquery, Stock.id == subquery.c.stock_id
-    ).join(
-        CompositeScore, CompositeScore.id == subquery.c.score_id
-    ).order_by(
-        desc(CompositeScore.fundamental_score)
-    ).limit(limit).all()
-    
-    return [
-        {
-            "rank": idx + 1,
-            "symbol": stock.symbol,
-            "name": stock.name,
-            "fundamental_score": score.fundamental_score,
-            "sentiment_score": score.sentiment_score,
-            "composite_score": score.composite_score
-        }
-        for idx, (stock, score) in enumerate(results)
-    ]
+    return rank_latest_scores(db, LatestCompositeScore.fundamental_score, limit, offset)
 
 
 @router.get("/rankings/sentiment", response_model=List[dict])
+@cache(expire=settings.RANKINGS_CACHE_TTL, namespace=RANKINGS_NAMESPACE)
 def get_sentiment_rankings(
     limit: int = 50,
+    offset: int = Query(default=0, ge=0, le=settings.MAX_PAGE_OFFSET),
     db: Session = Depends(get_db)
 ):
     """
@@ -222,38 +333,10 @@ def get_sentiment_rankings(
     
     Args:
         limit: Number of top stocks
+        offset: Number of ranked stocks to skip
         db: Database session
         
     Returns:
         Top stocks by sentiment
     """
-    # Get latest scores
-    subquery = db.query(
-        CompositeScore.stock_id,
-        CompositeScore.id.label("score_id")
-    ).distinct(
-        CompositeScore.stock_id
-    ).order_by(
-        CompositeScore.stock_id,
-        desc(CompositeScore.score_date)
-    ).limit(1000).subquery()
-    
-    results = db.query(Stock, CompositeScore).join(
-        subquery, Stock.id == subquery.c.stock_id
-    ).join(
-        CompositeScore, CompositeScore.id == subquery.c.score_id
-    ).order_by(
-        desc(CompositeScore.sentiment_score)
-    ).limit(limit).all()
-    
-    return [
-        {
-            "rank": idx + 1,
-            "symbol": stock.symbol,
-            "name": stock.name,
-            "fundamental_score": score.fundamental_score,
-            "sentiment_score": score.sentiment_score,
-            "composite_score": score.composite_score
-        }
-        for idx, (stock, score) in enumerate(results)
-    ]
+    return rank_latest_scores(db, LatestCompositeScore.sentiment_score, limit, offset)
@@ -4,11 +4,15 @@ Provides access to stock information, fundamentals, sentiment, and scores.
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi_cache.decorator import cache
+from sqlalchemy.orm import Session, aliased, joinedload, raiseload
+from sqlalchemy import desc, select, true
 
+from ...core.cache import SECTORS_NAMESPACE
+from ...core.config import settings
 from ...core.database import get_db
 from ...core.logging import get_logger
+from ...core.stock_ids import get_stock_id
 from ...models.database import Stock, Fundamental, CompositeScore, SentimentScore
 from ...models.schemas import (
     StockResponse,
@@ -21,10 +25,29 @@ from ...models.schemas import (
 logger = get_logger(__name__)
 router = APIRouter()
 
+def resolve_stock_id(symbol: str, db: Session = Depends(get_db)) -> int:
+    """
+    Resolve a stock symbol to its ID, caching the mapping in-process.
+    
+    Args:
+        symbol: Stock symbol
+        db: Database session
+        
+    Returns:
+        Stock ID
+    """
+    symbol = symbol.upper()
+    stock_id = get_stock_id(db, symbol)
+    
+    if stock_id is None:
+        raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
+    
+    return stock_id
+
 
 @router.get("/", response_model=List[StockResponse])
 def list_stocks(
-    skip: int = Query(default=0, ge=0),
+    skip: int = Query(default=0, ge=0, le=settings.MAX_PAGE_OFFSET),
     limit: int = Query(default=50, ge=1, le=500),
     sector: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -41,12 +64,16 @@ def list_stocks(
     Returns:
         List of stocks
     """
-    query = db.query(Stock).filter(Stock.is_active == True)
+    # Plain row mappings are validated straight into the response model,
+    # skipping ORM instance construction and identity-map bookkeeping
+    query = select(Stock.__table__).where(Stock.is_active == True)
     
     if sector:
-        query = query.filter(Stock.sector == sector)
+        query = query.where(Stock.sector == sector)
     
-    stocks = query.offset(skip).limit(limit).all()
+    # Ordered by the unique symbol index, so offset pages are stable and
+    # clients get the list already sorted
+    stocks = db.execute(query.order_by(Stock.symbol).offset(skip).limit(limit)).mappings().all()
     
     return stocks
 
@@ -63,21 +90,31 @@ def get_stock(symbol: str, db: Session = Depends(get_db)):
     Returns:
         Stock with latest score and fundamentals
     """
-    # Get stock
-    stock = db.query(Stock).filter(Stock.symbol == symbol.upper()).first()
+    # Latest fundamental and composite score resolved per stock via lateral joins,
+    # so the stock and both of its latest records come back in one round trip
+    fundamental_subquery = select(Fundamental).where(
+        Fundamental.stock_id == Stock.id
+    ).order_by(desc(Fundamental.data_date)).limit(1).lateral()
+    
+    score_subquery = select(CompositeScore).where(
+        CompositeScore.stock_id == Stock.id
+    ).order_by(desc(CompositeScore.score_date)).limit(1).lateral()
+    
+    LatestFundamental = aliased(Fundamental, fundamental_subquery)
+    LatestScore = aliased(CompositeScore, score_subquery)
+    
+    row = db.query(Stock, LatestFundamental, LatestScore).outerjoin(
+        LatestFundamental, true()
+    ).outerjoin(
+        LatestScore, true()
+    ).filter(
+        Stock.symbol == symbol.upper()
+    ).first()
     
-    if not stock:
+    if not row:
         raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
     
-    # Get latest fundamental data
-    latest_fundamental = db.query(Fundamental).filter(
-        Fundamental.stock_id == stock.id
-    ).order_by(desc(Fundamental.data_date)).first()
-    
-    # Get latest composite score
-    latest_score = db.query(CompositeScore).filter(
-        CompositeScore.stock_id == stock.id
-    ).order_by(desc(CompositeScore.score_date)).first()
+    stock, latest_fundamental, latest_score = row
     
     return {
         "stock": stock,
@@ -88,7 +125,7 @@ def get_stock(symbol: str, db: Session = Depends(get_db)):
 
 @router.get("/{symbol}/fundamentals", response_model=List[FundamentalResponse])
 def get_stock_fundamentals(
-    symbol: str,
+    stock_id: int = Depends(resolve_stock_id),
     limit: int = Query(default=10, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
@@ -96,28 +133,25 @@ def get_stock_fundamentals(
     Get historical fundamental data for a stock.
     
     Args:
-        symbol: Stock symbol
+        stock_id: Stock ID resolved from the symbol path parameter
         limit: Number of historical records
         db: Database session
         
     Returns:
         List of fundamental data points
     """
-    stock = db.query(Stock).filter(Stock.symbol == symbol.upper()).first()
-    
-    if not stock:
-        raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
-    
-    fundamentals = db.query(Fundamental).filter(
-        Fundamental.stock_id == stock.id
-    ).order_by(desc(Fundamental.data_date)).limit(limit).all()
+    fundamentals = db.execute(
+        select(Fundamental.__table__).where(
+            Fundamental.stock_id == stock_id
+        ).order_by(desc(Fundamental.data_date)).limit(limit)
+    ).mappings().all()
     
     return fundamentals
 
 
 @router.get("/{symbol}/scores", response_model=List[CompositeScoreResponse])
 def get_stock_scores(
-    symbol: str,
+    stock_id: int = Depends(resolve_stock_id),
     limit: int = Query(default=30, ge=1, le=365),
     db: Session = Depends(get_db)
 ):
@@ -125,32 +159,27 @@ def get_stock_scores(
     Get historical composite scores for a stock.
     
     Args:
-        symbol: Stock symbol
+        stock_id: Stock ID resolved from the symbol path parameter
         limit: Number of historical records
         db: Database session
         
     Returns:
         List of composite scores
     """
-    stock = db.query(Stock).filter(Stock.symbol == symbol.upper()).first()
-    
-    if not stock:
-        raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
-    
-    scores = db.query(CompositeScore).filter(
-        CompositeScore.stock_id == stock.id
-    ).order_by(desc(CompositeScore.score_date)).limit(limit).all()
+    # Score history can run to a year of rows; validate plain mappings rather
+    # than reflecting attributes off ORM instances
+    scores = db.execute(
+        select(CompositeScore.__table__).where(
+            CompositeScore.stock_id == stock_id
+        ).order_by(desc(CompositeScore.score_date)).limit(limit)
+    ).mappings().all()
     
     return scores
 
 
-from sqlalchemy.orm import Session, joinedload
-
-# ... (imports remain the same, just adding joinedload if not present, but for replace_file I will just modify the function)
-
 @router.get("/{symbol}/sentiment", response_model=List[SentimentScoreResponse])
 def get_stock_sentiment(
-    symbol: str,
+    stock_id: int = Depends(resolve_stock_id),
     limit: int = Query(default=50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
@@ -158,28 +187,27 @@ def get_stock_sentiment(
     Get recent sentiment scores for a stock.
     
     Args:
-        symbol: Stock symbol
+        stock_id: Stock ID resolved from the symbol path parameter
         limit: Number of sentiment records
         db: Database session
         
     Returns:
         List of sentiment scores
     """
-    stock = db.query(Stock).filter(Stock.symbol == symbol.upper()).first()
-    
-    if not stock:
-        raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
-    
+    # SentimentScore -> News is many-to-one, so a joined eager load adds no
+    # duplicate rows; any other relationship access is an accidental lazy load
     sentiments = db.query(SentimentScore).options(
-        joinedload(SentimentScore.news)
+        joinedload(SentimentScore.news),
+        raiseload("*")
     ).filter(
-        SentimentScore.stock_id == stock.id
+        SentimentScore.stock_id == stock_id
     ).order_by(desc(SentimentScore.created_at)).limit(limit).all()
     
     return sentiments
 
 
 @router.get("/sectors/list", response_model=List[str])
+@cache(expire=settings.SECTORS_CACHE_TTL, namespace=SECTORS_NAMESPACE)
 def list_sectors(db: Session = Depends(get_db)):
     """
     Get list of all sectors.
@@ -0,0 +1,142 @@
+"""
+Response caching for read-heavy API endpoints.
+Backed by Redis via fastapi-cache2; only shared (non user-scoped) data may be cached.
+"""
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .config import settings
+from .logging import get_logger
+from .redis_client import get_redis
+
+logger = get_logger(__name__)
+
+# Cache namespaces
+RANKINGS_NAMESPACE = "rankings"
+SECTORS_NAMESPACE = "sectors"
+
+# Header fastapi-cache sets on every response served through @cache
+CACHE_STATUS_HEADER = "X-FastAPI-Cache"
+
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build a cache key from the request path and query parameters.
+
+    Injected dependencies (e.g. the database session) differ on every call,
+    so they are deliberately left out of the key.
+
+    Args:
+        func: Cached endpoint function
+        namespace: Cache namespace (already prefixed)
+        request: Incoming request
+        response: Outgoing response
+        args: Positional arguments of the endpoint
+        kwargs: Keyword arguments of the endpoint
+
+    Returns:
+        Cache key string
+    """
+    if request is None:
+        return f"{namespace}:{func.__module__}:{func.__name__}"
+
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.items()))
+    return f"{namespace}:{request.url.path}?{query}"
+
+
+def init_cache() -> None:
+    """Initialize the FastAPI response cache with the Redis backend."""
+    redis = aioredis.from_url(settings.REDIS_URL)
+    FastAPICache.init(
+        RedisBackend(redis),
+        prefix=settings.CACHE_PREFIX,
+        key_builder=request_key_builder,
+        cache_status_header=CACHE_STATUS_HEADER,
+    )
+    logger.info("Response cache initialized")
+
+
+async def stable_etag_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """
+    Give cached responses an ETag that is the same in every worker.
+
+    fastapi-cache2 builds its ETag from Python's hash(), which is randomized
+    per process, so a tag from one worker (or from before a restart) never
+    matches on another. Cached responses get a SHA-1 of the body instead, and
+    a matching If-None-Match is answered with 304 Not Modified.
+
+    Args:
+        request: Incoming request
+        call_next: Next handler in the middleware chain
+
+    Returns:
+        The response with a content-based ETag, or an empty 304
+    """
+    response = await call_next(request)
+    if CACHE_STATUS_HEADER not in response.headers or response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'W/"{hashlib.sha1(body, usedforsecurity=False).hexdigest()}"'
+    response.headers["ETag"] = etag
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=304,
+            headers={
+                "ETag": etag,
+                "Cache-Control": response.headers.get("Cache-Control", ""),
+            },
+        )
+
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers=dict(response.headers),
+        media_type=response.media_type,
+    )
+
+
+def clear_cache_namespace(namespace: str) -> int:
+    """
+    Delete all cached responses in a namespace.
+
+    Uses the synchronous Redis client so it can be called from Celery tasks,
+    where the async FastAPICache backend is not initialized.
+
+    Args:
+        namespace: Cache namespace to clear
+
+    Returns:
+        Number of keys deleted
+    """
+    pattern = f"{settings.CACHE_PREFIX}:{namespace}:*"
+    deleted = 0
+
+    try:
+        client = get_redis()
+        for key in client.scan_iter(match=pattern):
+            deleted += client.delete(key)
+    except Exception as e:
+        # Stale entries expire on their own; never fail the caller over it
+        logger.warning(f"Failed to clear cache namespace '{namespace}': {e}")
+        return deleted
+
+    logger.info(f"Cleared {deleted} cached responses in namespace '{namespace}'")
+    return deleted
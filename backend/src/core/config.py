@@ -3,7 +3,9 @@ Configuration management using Pydantic Settings v2.
 All configuration is loaded from environment variables for security.
 """
 import os
-from typing import Any, Dict, List, Optional
+import orjson
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional, Tuple
 from pydantic import field_validator, Field, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -31,6 +33,12 @@ class Settings(BaseSettings):
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str
     DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 10  # Seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PING_IDLE_SECONDS: int = 60  # Ping on checkout only after this much idle time
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
     
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
@@ -52,6 +60,8 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_URL: Optional[str] = None
+    REDIS_POOL_SIZE: int = 50
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # Seconds idle before a connection is re-checked
     
     @field_validator("REDIS_URL", mode="before")
     @classmethod
@@ -62,31 +72,43 @@ class Settings(BaseSettings):
         values = info.data
         return f"redis://{values.get('REDIS_HOST')}:{values.get('REDIS_PORT')}/{values.get('REDIS_DB')}"
     
+    # Response Caching
+    CACHE_PREFIX: str = "pss"
+    RANKINGS_CACHE_TTL: int = 3600  # 1 hour
+    SECTORS_CACHE_TTL: int = 86400  # 24 hours
+    
     # API Configuration
     API_V1_PREFIX: str = "/api/v1"
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
-    BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000"]
+    BACKEND_CORS_ORIGINS: Tuple[str, ...] = ("http://localhost:3000",)
+    GZIP_MINIMUM_SIZE: int = 1000  # Bytes; smaller responses are sent as-is
     
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
-    def parse_cors_origins(cls, v: Any) -> List[str]:
-        """Parse CORS origins from string or list."""
+    def parse_cors_origins(cls, v: Any) -> Tuple[str, ...]:
+        """Parse CORS origins from a JSON string or list, once at load time."""
         if isinstance(v, str):
-            import json
-            return json.loads(v)
-        return v
+            v = orjson.loads(v)
+        return tuple(v)
     
     # Security
     SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12
+    LOGIN_MAX_FAILED_ATTEMPTS: int = 5
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 60
+    AUTH_CACHE_TTL_SECONDS: int = 60
     
     # Data Source API Keys
     MARKET_DATA_API_KEY: Optional[str] = None
     MARKET_DATA_BASE_URL: Optional[str] = None
     NEWS_API_KEY: Optional[str] = None
     NEWS_API_BASE_URL: str = "https://newsapi.org/v2"
+    NEWS_API_DAILY_QUOTA: int = Field(default=100, ge=1)  # Requests per day on the plan
+    NEWS_API_BURST: int = Field(default=10, ge=1)         # Requests allowed back to back
+    NEWS_API_MAX_WAIT_SECONDS: float = 30.0               # Longest wait for quota before skipping a query
     ALPHA_VANTAGE_API_KEY: Optional[str] = None
     
     # Scoring Configuration
@@ -120,6 +142,16 @@ class Settings(BaseSettings):
     # Sentiment Analysis
     SENTIMENT_MODEL: str = "ProsusAI/finbert"
     SENTIMENT_CONFIDENCE_THRESHOLD: float = 0.7
+    SENTIMENT_BATCH_SIZE: int = Field(default=32, ge=1)  # Articles per model forward pass
+    SENTIMENT_TORCH_COMPILE: bool = False  # Compile the model (slow first batch, faster after)
+    SENTIMENT_ONNX_INT8: bool = True  # On CPU, use INT8 ONNX Runtime when the "onnx" extra is installed
+    SENTIMENT_ONNX_CACHE_DIR: str = "~/.cache/stock-screener/onnx"  # Exported quantized models
+    
+    @field_validator("SENTIMENT_ONNX_CACHE_DIR")
+    @classmethod
+    def resolve_onnx_cache_dir(cls, v: str) -> str:
+        """Anchor the ONNX cache so every worker shares one directory."""
+        return os.path.abspath(os.path.expanduser(v))
     
     # Celery Configuration
     CELERY_BROKER_URL: Optional[str] = None
@@ -149,6 +181,13 @@ class Settings(BaseSettings):
     NEWS_INGESTION_CRON: str = "0 */2 * * *"          # Every 2 hours
     SCORING_CRON: str = "0 18 * * 1-5"                # Daily at 6 PM IST
     
+    # Ingestion
+    INGESTION_CONCURRENCY: int = Field(default=16, ge=1)
+    NEWS_RETENTION_DAYS: int = Field(default=0, ge=0)  # Purge older news; 0 keeps everything
+    
+    # Pagination
+    MAX_PAGE_OFFSET: int = Field(default=1000, ge=0)  # Deepest offset accepted; use cursors beyond it
+    
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_BURST: int = 10
@@ -159,23 +198,24 @@ class Settings(BaseSettings):
     ENABLE_TRACING: bool = False
     JAEGER_HOST: str = "localhost"
     JAEGER_PORT: int = 6831
+    HEALTH_CHECK_CACHE_SECONDS: float = 2.0  # Reuse probe results across rapid health checks
     
     # Stock Universe
     TRACKED_STOCKS: str = Field(
         default="RELIANCE,TCS,INFY,HDFCBANK,ICICIBANK,BHARTIARTL,ITC,SBIN,LT,HINDUNILVR"
     )
     
-    def get_tracked_stocks_list(self) -> List[str]:
-        """Get tracked stocks as a list."""
-        if isinstance(self.TRACKED_STOCKS, str):
-            return [s.strip().upper() for s in self.TRACKED_STOCKS.split(",") if s.strip()]
-        return self.TRACKED_STOCKS
+    @cached_property
+    def tracked_stocks(self) -> Tuple[str, ...]:
+        """Tracked stock symbols, parsed once from TRACKED_STOCKS."""
+        return tuple(s.strip().upper() for s in self.TRACKED_STOCKS.split(",") if s.strip())
 
 
 # Global settings instance
 settings = Settings()
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get application settings.
@@ -1,28 +1,96 @@
 """
 Database connection and session management.
 """
-from sqlalchemy import create_engine, text
+import time
+import orjson
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
 from contextlib import contextmanager
 from typing import Generator
 
 from .config import settings
 from .logging import get_logger
-from ..models.database import Base
+from ..models.database import Base, LatestCompositeScore
 
 logger = get_logger(__name__)
 
+LATEST_SCORES_VIEW = LatestCompositeScore.__tablename__
+
+LATEST_SCORES_VIEW_DDL = [
+    f"""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS {LATEST_SCORES_VIEW} AS
+    SELECT DISTINCT ON (stock_id) *
+    FROM composite_scores
+    ORDER BY stock_id, score_date DESC
+    """,
+    # Unique index is required for REFRESH ... CONCURRENTLY
+    f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{LATEST_SCORES_VIEW}_stock_id ON {LATEST_SCORES_VIEW} (stock_id)",
+]
+
+
+def _json_serializer(value) -> str:
+    """Serialize JSON/JSONB column values with orjson."""
+    return orjson.dumps(
+        value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
 
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_reset_on_return="rollback",
+    connect_args={"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"},
+    executemany_mode="values_plus_batch",  # Multi-row VALUES for bulk inserts (psycopg2)
+    insertmanyvalues_page_size=1000,  # Rows per multi-row INSERT statement
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
     echo=settings.DEBUG,  # Log SQL queries in debug mode
 )
 
+
+
+@event.listens_for(engine, "checkin")
+def _mark_last_used(dbapi_connection, connection_record) -> None:
+    """Record when a connection was returned to the pool."""
+    connection_record.info["last_used"] = time.monotonic()
+
+
+@event.listens_for(engine, "checkout")
+def _ping_if_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+    """
+    Ping a pooled connection only if it has been idle for a while.
+    
+    Recently used connections are handed out without a round trip. Raising
+    DisconnectionError makes the pool discard the connection and retry the
+    checkout with a fresh one.
+    """
+    last_used = connection_record.info.get("last_used")
+    if last_used is None or time.monotonic() - last_used < settings.DB_POOL_PING_IDLE_SECONDS:
+        return
+    
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    except Exception as e:
+        logger.warning(f"Discarding stale database connection: {e}")
+        raise DisconnectionError() from e
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+logger.info(
+    f"Database pool: size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW}, "
+    f"timeout={settings.DB_POOL_TIMEOUT}s, recycle={settings.DB_POOL_RECYCLE}s"
+)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -72,10 +140,28 @@ def init_db() -> None:
     This should only be used in development. In production, use Alembic migrations.
     """
     logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    tables = [t for t in Base.metadata.sorted_tables if not t.info.get("is_view")]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    
+    with engine.begin() as conn:
+        for statement in LATEST_SCORES_VIEW_DDL:
+            conn.execute(text(statement))
     logger.info("Database tables created successfully")
 
 
+def refresh_latest_scores_view(db: Session) -> None:
+    """
+    Refresh the latest composite scores materialized view.
+    
+    Runs concurrently so ranking reads are not blocked during the refresh.
+    
+    Args:
+        db: Database session
+    """
+    db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {LATEST_SCORES_VIEW}"))
+    logger.info(f"Refreshed materialized view {LATEST_SCORES_VIEW}")
+
+
 def check_db_connection() -> bool:
     """
     Check if database connection is working.
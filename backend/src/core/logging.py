@@ -1,11 +1,17 @@
 """
 Structured logging configuration with JSON formatting and correlation IDs.
 """
+import atexit
+import copy
+import io
 import logging
+import os
+import queue
 import sys
-import json
+import orjson
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from contextvars import ContextVar
 import uuid
 
@@ -15,6 +21,12 @@ from .config import settings
 # Context variable for request/correlation ID
 request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
+# Background listener that owns the real (blocking) output handler
+_log_listener: Optional[QueueListener] = None
+
+# Bytes of console output coalesced into a single write
+LOG_BUFFER_SIZE = 8192
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
@@ -29,8 +41,9 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON formatted log string
         """
+        # Use the record's own creation time rather than reading the clock again
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -39,8 +52,10 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
         
-        # Add request/correlation ID if available
-        request_id = request_id_var.get()
+        # Add request/correlation ID if available (captured on the emitting
+        # thread by ContextQueueHandler, since formatting happens off-thread)
+        record_fields = record.__dict__
+        request_id = record_fields.get("request_id") or request_id_var.get()
         if request_id:
             log_data["request_id"] = request_id
         
@@ -49,23 +64,148 @@ class JSONFormatter(logging.Formatter):
             log_data["exception"] = self.formatException(record.exc_info)
         
         # Add any extra fields from the log record
-        if hasattr(record, "extra_fields"):
-            log_data.update(record.extra_fields)
+        extra_fields = record_fields.get("extra_fields")
+        if extra_fields:
+            log_data.update(extra_fields)
+        
+        # orjson renders the UTC timestamp with a trailing "Z";
+        # non-serializable extra fields fall back to str()
+        return orjson.dumps(log_data, default=str, option=orjson.OPT_UTC_Z).decode()
+
+
+class ContextQueueHandler(QueueHandler):
+    """Queue handler that carries the request ID across to the listener thread."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Attach the current request ID before the record leaves this thread.
+        
+        Args:
+            record: Log record
+            
+        Returns:
+            Record to enqueue
+        """
+        # The queue is in-process, so the record is not pickled: merge the
+        # message args now but keep exc_info for the formatter's exception field
+        record = copy.copy(record)
+        record.request_id = request_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """Stream handler that leaves flushing to the listener, except for warnings and errors."""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Write a record without flushing, so bursts coalesce into fewer writes.
+        
+        Args:
+            record: Log record
+        """
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            # Problems should show up immediately
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class FlushingQueueListener(QueueListener):
+    """Queue listener that flushes its handlers once the queue is drained."""
+    
+    def handle(self, record: logging.LogRecord) -> None:
+        """
+        Dispatch a record and flush when no more records are waiting.
         
-        return json.dumps(log_data)
+        Args:
+            record: Log record
+        """
+        super().handle(record)
+        if self.queue.empty():
+            _flush_handlers(self.handlers)
+
+
+def _flush_handlers(handlers) -> None:
+    """Flush the given handlers, ignoring closed streams."""
+    for handler in handlers:
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def _buffered_stdout() -> io.TextIOBase:
+    """
+    Open a block-buffered text stream over stdout.
+    
+    Returns:
+        Buffered stream, or sys.stdout itself if it has no file descriptor
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return sys.stdout
+    return open(fd, "w", buffering=LOG_BUFFER_SIZE, encoding="utf-8", closefd=False)
+
+
+def _stop_log_listener() -> None:
+    """Flush queued records and stop the background log listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _flush_handlers(_log_listener.handlers)
+        _log_listener = None
+
+
+def _flush_before_fork() -> None:
+    """Flush buffered output so forked children do not inherit and re-write it."""
+    if _log_listener is not None:
+        _flush_handlers(_log_listener.handlers)
+
+
+def _restart_log_listener_in_child() -> None:
+    """Start a fresh listener thread in forked children (e.g. Celery workers)."""
+    global _log_listener
+    if _log_listener is None:
+        return
+    
+    # Use a new queue: records still pending in the inherited one belong to the parent
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, ContextQueueHandler):
+            handler.queue = log_queue
+    
+    _log_listener = FlushingQueueListener(log_queue, *_log_listener.handlers, respect_handler_level=True)
+    _log_listener.start()
+
+
+atexit.register(_stop_log_listener)
+os.register_at_fork(before=_flush_before_fork, after_in_child=_restart_log_listener_in_child)
 
 
 def setup_logging() -> None:
     """
     Configure application-wide logging.
     
-    Sets up JSON formatted logging with appropriate log levels.
+    Sets up JSON formatted logging with appropriate log levels. Records are
+    enqueued by the emitting thread and written to stdout by a single
+    background listener, so callers never block on console I/O. Output is
+    block-buffered and flushed whenever the queue drains or a warning or
+    error is logged.
     """
+    global _log_listener
+    
     # Get log level from settings
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
     
     # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = BufferedStreamHandler(_buffered_stdout())
     console_handler.setLevel(log_level)
     
     # Use JSON formatter for production, simple format for development
@@ -80,11 +220,17 @@ def setup_logging() -> None:
     
     console_handler.setFormatter(formatter)
     
+    # Replace any previous listener (setup_logging may be called more than once)
+    _stop_log_listener()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_listener = FlushingQueueListener(log_queue, console_handler, respect_handler_level=True)
+    _log_listener.start()
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     root_logger.handlers.clear()
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(ContextQueueHandler(log_queue))
     
     # Reduce noise from third-party libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -135,12 +281,19 @@ def log_with_extra(logger: logging.Logger, level: int, message: str, **extra: An
     """
     Log a message with additional context fields.
     
+    Returns without building a record when the level is disabled. For plain
+    logger calls, prefer %-style arguments over f-strings so filtered
+    messages are never formatted.
+    
     Args:
         logger: Logger instance
         level: Log level (e.g., logging.INFO)
         message: Log message
         **extra: Additional fields to include in the log
     """
+    if not logger.isEnabledFor(level):
+        return
+    
     # Create a log record with extra fields
     record = logger.makeRecord(
         name=logger.name,
@@ -25,8 +25,11 @@ class RedisClient:
         if self._client is None:
             self._pool = redis.ConnectionPool.from_url(
                 settings.REDIS_URL,
-                max_connections=20,
-                decode_responses=True
+                max_connections=settings.REDIS_POOL_SIZE,
+                decode_responses=True,
+                socket_keepalive=True,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                retry_on_timeout=True
             )
             self._client = redis.Redis(connection_pool=self._pool)
             logger.info("Redis connection established")
@@ -8,14 +8,26 @@ from jose import jwt
 from passlib.context import CryptContext
 from dotenv import load_dotenv
 
+from .config import settings
+from .logging import get_logger
+from .redis_client import get_redis
+
 load_dotenv()
 
+logger = get_logger(__name__)
+
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080")) # 7 days default
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    deprecated="auto"
+)
+
+LOGIN_FAILURES_KEY = "auth:login_failures:{client_id}"
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -36,3 +48,54 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+def is_login_throttled(client_id: str) -> bool:
+    """
+    Check whether a client has exceeded the failed login limit.
+    
+    Checked before password verification so repeated failures do not
+    cost a bcrypt hash each. Fails open if Redis is unavailable.
+    
+    Args:
+        client_id: Client identifier (e.g. remote IP)
+        
+    Returns:
+        True if further login attempts should be rejected
+    """
+    try:
+        failures = get_redis().get(LOGIN_FAILURES_KEY.format(client_id=client_id))
+    except Exception as e:
+        logger.warning(f"Login throttle check failed: {e}")
+        return False
+    
+    return failures is not None and int(failures) >= settings.LOGIN_MAX_FAILED_ATTEMPTS
+
+
+def record_failed_login(client_id: str) -> None:
+    """
+    Count a failed login attempt within the failure window.
+    
+    Args:
+        client_id: Client identifier (e.g. remote IP)
+    """
+    key = LOGIN_FAILURES_KEY.format(client_id=client_id)
+    try:
+        client = get_redis()
+        if client.incr(key) == 1:
+            client.expire(key, settings.LOGIN_FAILURE_WINDOW_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to record login failure: {e}")
+
+
+def clear_failed_logins(client_id: str) -> None:
+    """
+    Reset the failed login counter after a successful login.
+    
+    Args:
+        client_id: Client identifier (e.g. remote IP)
+    """
+    try:
+        get_redis().delete(LOGIN_FAILURES_KEY.format(client_id=client_id))
+    except Exception as e:
+        logger.warning(f"Failed to clear login failures: {e}")
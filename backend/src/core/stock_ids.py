@@ -0,0 +1,80 @@
+"""
+In-process symbol -> stock ID lookups shared by the API and ingestion.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.database import Stock
+
+# Most symbols kept; least recently used entries are evicted beyond this
+STOCK_ID_CACHE_SIZE = 10_000
+
+_stock_ids: "OrderedDict[str, int]" = OrderedDict()
+_stock_ids_lock = threading.Lock()
+
+
+def get_stock_ids(db: Session, symbols: Iterable[str]) -> Dict[str, int]:
+    """
+    Resolve stock symbols to IDs, querying only the ones not cached yet.
+
+    Args:
+        db: Database session
+        symbols: Upper-case stock symbols
+
+    Returns:
+        Mapping of the symbols that exist to their stock IDs
+    """
+    found: Dict[str, int] = {}
+    unknown = []
+    with _stock_ids_lock:
+        for symbol in set(symbols):
+            stock_id = _stock_ids.get(symbol)
+            if stock_id is None:
+                unknown.append(symbol)
+            else:
+                _stock_ids.move_to_end(symbol)
+                found[symbol] = stock_id
+
+    if unknown:
+        loaded = dict(
+            db.execute(select(Stock.symbol, Stock.id).where(Stock.symbol.in_(unknown))).all()
+        )
+        found.update(loaded)
+        with _stock_ids_lock:
+            _stock_ids.update(loaded)
+            while len(_stock_ids) > STOCK_ID_CACHE_SIZE:
+                _stock_ids.popitem(last=False)
+
+    return found
+
+
+def get_stock_id(db: Session, symbol: str) -> Optional[int]:
+    """
+    Resolve a single stock symbol to its ID.
+
+    Args:
+        db: Database session
+        symbol: Upper-case stock symbol
+
+    Returns:
+        Stock ID, or None if the stock does not exist
+    """
+    return get_stock_ids(db, (symbol,)).get(symbol)
+
+
+def invalidate_stock_ids(*symbols: str) -> None:
+    """
+    Drop cached stock IDs; call after deleting or re-creating stocks.
+
+    Args:
+        symbols: Symbols to drop (all of them when none are given)
+    """
+    with _stock_ids_lock:
+        if not symbols:
+            _stock_ids.clear()
+        for symbol in symbols:
+            _stock_ids.pop(symbol, None)
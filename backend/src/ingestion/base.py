@@ -3,30 +3,46 @@ Base class for all data ingestors.
 Provides common functionality: idempotency, retry logic, logging, error handling.
 """
 import time
+import random
 import hashlib
+import logging
+import uuid
+import httpx
+import orjson
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, Dict, Optional, Callable
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Callable, Tuple, Type
 from functools import wraps
 
+from sqlalchemy import exists
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from ..core.logging import get_logger
+from ..core.logging import get_logger, log_with_extra, request_id_var
 from ..core.database import get_db_context
 from ..models.database import IngestionLog
 
 
 logger = get_logger(__name__)
 
+# Errors worth retrying: network hiccups and dropped database connections
+TRANSIENT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError, OperationalError)
 
-def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0):
+
+def retry_with_backoff(
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+):
     """
-    Decorator for retrying functions with exponential backoff.
+    Decorator for retrying functions with jittered exponential backoff.
     
     Args:
         max_retries: Maximum number of retry attempts
         base_delay: Initial delay in seconds
         max_delay: Maximum delay in seconds
+        retry_on: Exception types that trigger a retry; anything else is raised immediately
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -36,14 +52,15 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0, max_delay:
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
+                except retry_on as e:
                     last_exception = e
                     
                     if attempt < max_retries:
-                        delay = min(base_delay * (2 ** attempt), max_delay)
+                        # Jitter spreads out retries from runs scheduled at the same time
+                        delay = min(base_delay * (2 ** attempt), max_delay) * random.uniform(0.5, 1.5)
                         logger.warning(
                             f"Attempt {attempt + 1}/{max_retries + 1} failed for {func.__name__}: {e}. "
-                            f"Retrying in {delay}s..."
+                            f"Retrying in {delay:.1f}s..."
                         )
                         time.sleep(delay)
                     else:
@@ -112,14 +129,21 @@ class BaseIngestor(ABC):
         """
         Compute hash of data for idempotency check.
         
+        Serializes straight to bytes with sorted keys, so the hash does not
+        depend on dict ordering (e.g. the completion order of concurrent fetches).
+        
         Args:
             data: Data to hash
             
         Returns:
             SHA256 hash string
         """
-        data_str = str(data).encode('utf-8')
-        return hashlib.sha256(data_str).hexdigest()
+        data_bytes = orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NAIVE_UTC
+        )
+        return hashlib.sha256(data_bytes, usedforsecurity=False).hexdigest()
     
     def is_already_ingested(self, data_hash: str, db: Session) -> bool:
         """
@@ -132,13 +156,13 @@ class BaseIngestor(ABC):
         Returns:
             True if already ingested, False otherwise
         """
-        existing_log = db.query(IngestionLog).filter(
-            IngestionLog.ingestion_type == self.ingestion_type,
-            IngestionLog.data_hash == data_hash,
-            IngestionLog.status == "success"
-        ).first()
-        
-        return existing_log is not None
+        return db.query(
+            exists().where(
+                IngestionLog.ingestion_type == self.ingestion_type,
+                IngestionLog.data_hash == data_hash,
+                IngestionLog.status == "success"
+            )
+        ).scalar()
     
     def create_ingestion_log(
         self,
@@ -156,6 +180,9 @@ class BaseIngestor(ABC):
         """
         Create an ingestion log entry.
         
+        The entry is added to the session but not committed; the caller's
+        transaction commits it together with the ingested data.
+        
         Args:
             db: Database session
             data_hash: Hash of ingested data
@@ -191,7 +218,6 @@ class BaseIngestor(ABC):
         )
         
         db.add(log)
-        db.commit()
         
         self.logger.info(
             f"Ingestion log created: type={self.ingestion_type}, status={status}, "
@@ -201,16 +227,35 @@ class BaseIngestor(ABC):
         
         return log
     
-    @retry_with_backoff(max_retries=3, base_delay=2.0)
+    @retry_with_backoff(max_retries=3, base_delay=2.0, retry_on=TRANSIENT_ERRORS)
     def run(self) -> Dict[str, Any]:
         """
         Run the ingestion process.
         
+        Every log record emitted during the run carries a fresh run ID as its
+        correlation ID, so scheduled runs can be traced like HTTP requests.
+        
+        Returns:
+            Dictionary with ingestion results and metrics
+        """
+        token = request_id_var.set(uuid.uuid4().hex)
+        try:
+            return self._run()
+        finally:
+            request_id_var.reset(token)
+    
+    def _run(self) -> Dict[str, Any]:
+        """
+        Fetch, deduplicate, store and audit one batch of data.
+        
         Returns:
             Dictionary with ingestion results and metrics
         """
-        started_at = datetime.utcnow()
-        self.logger.info(f"Starting {self.ingestion_type} ingestion from {self.source}")
+        started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        log_with_extra(
+            self.logger, logging.INFO, "ingestion_started",
+            ingestion_type=self.ingestion_type, source=self.source
+        )
         
         try:
             # Fetch data
@@ -233,7 +278,9 @@ class BaseIngestor(ABC):
             # Compute hash for idempotency
             data_hash = self.compute_data_hash(data)
             
-            # Check if already ingested
+            # Idempotency check, processing and the audit log share one
+            # session, committed when the block exits (ingestors may also
+            # commit large batches in chunks)
             with get_db_context() as db:
                 if self.is_already_ingested(data_hash, db):
                     self.logger.info(f"Data already ingested (hash: {data_hash[:16]}...)")
@@ -247,7 +294,7 @@ class BaseIngestor(ABC):
                 self.logger.info("Processing data...")
                 metrics = self.process_data(data, db)
                 
-                completed_at = datetime.utcnow()
+                completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
                 
                 # Create ingestion log
                 self.create_ingestion_log(
@@ -261,21 +308,25 @@ class BaseIngestor(ABC):
                     records_updated=metrics.get("updated", 0),
                     records_skipped=metrics.get("skipped", 0)
                 )
-                
-                self.logger.info(
-                    f"{self.ingestion_type} ingestion completed successfully. "
-                    f"Metrics: {metrics}"
-                )
-                
-                return {
-                    "status": "success",
-                    "message": "Ingestion completed successfully",
-                    "data_hash": data_hash,
-                    "metrics": metrics
-                }
+            
+            log_with_extra(
+                self.logger, logging.INFO, "ingestion_finished",
+                ingestion_type=self.ingestion_type,
+                source=self.source,
+                status="success",
+                duration_seconds=(completed_at - started_at).total_seconds(),
+                **metrics
+            )
+            
+            return {
+                "status": "success",
+                "message": "Ingestion completed successfully",
+                "data_hash": data_hash,
+                "metrics": metrics
+            }
         
         except Exception as e:
-            completed_at = datetime.utcnow()
+            completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
             error_message = str(e)
             
             self.logger.error(f"Ingestion failed: {error_message}", exc_info=True)
@@ -0,0 +1,104 @@
+"""
+Bloom filter over content hashes for cheap "never seen" checks during ingestion.
+"""
+import math
+import threading
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.logging import get_logger
+from ..models.database import News
+
+logger = get_logger(__name__)
+
+
+class ContentHashFilter:
+    """
+    Bloom filter keyed by SHA-256 hex digests.
+    
+    The digests are already uniformly distributed, so bit positions are
+    derived straight from them (double hashing) instead of rehashing.
+    A miss is definitive; a hit must be confirmed against the database.
+    """
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-6):
+        """
+        Initialize an empty filter.
+        
+        Args:
+            capacity: Expected number of hashes
+            error_rate: Target false positive rate at capacity
+        """
+        self.size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, content_hash: str) -> Iterator[int]:
+        """Yield the bit positions for a hex digest."""
+        h1 = int(content_hash[:16], 16)
+        h2 = int(content_hash[16:32], 16) | 1
+        size = self.size
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % size
+    
+    def add(self, content_hash: str) -> None:
+        """
+        Add a hash to the filter.
+        
+        Args:
+            content_hash: SHA-256 hex digest
+        """
+        bits = self._bits
+        for position in self._positions(content_hash):
+            bits[position >> 3] |= 1 << (position & 7)
+    
+    def update(self, content_hashes: Iterable[str]) -> None:
+        """
+        Add several hashes to the filter.
+        
+        Args:
+            content_hashes: SHA-256 hex digests
+        """
+        for content_hash in content_hashes:
+            self.add(content_hash)
+    
+    def __contains__(self, content_hash: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(content_hash)
+        )
+
+
+# Process-wide filter of stored news hashes, hydrated on first use
+_news_hashes: Optional[ContentHashFilter] = None
+_news_hashes_lock = threading.Lock()
+
+
+def get_news_hash_filter(db: Session) -> ContentHashFilter:
+    """
+    Get the news content hash filter, loading existing hashes on first call.
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        Shared content hash filter
+    """
+    global _news_hashes
+    if _news_hashes is not None:
+        return _news_hashes
+    
+    with _news_hashes_lock:
+        if _news_hashes is None:
+            seen = ContentHashFilter()
+            result = db.execute(
+                select(News.content_hash).execution_options(yield_per=10000)
+            ).scalars()
+            seen.update(result)
+            _news_hashes = seen
+            logger.info("Loaded news content hash filter")
+    
+    return _news_hashes
@@ -2,27 +2,52 @@
 Fundamental data ingestor for Indian stock market.
 Fetches financial metrics from configured data sources.
 """
-from datetime import datetime
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
-import httpx
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+# Imported at module load so the slow first import is paid at process start
+try:
+    import yfinance as yf
+except ImportError:
+    yf = None
+
 from .base import BaseIngestor
 from ..core.config import settings
 from ..models.database import Stock, Fundamental
 
+# Yahoo Finance suffix for NSE listings (BSE uses .BO)
+NSE_SUFFIX = ".NS"
+
+# Fundamental columns copied as-is from fetched data
+FUNDAMENTAL_FIELDS = (
+    "pe_ratio", "pb_ratio", "ps_ratio", "dividend_yield",
+    "roe", "roa", "operating_margin", "net_margin",
+    "debt_to_equity", "current_ratio", "quick_ratio",
+    "revenue_growth", "earnings_growth",
+    "current_price", "week_52_high", "week_52_low",
+)
+
 
 class FundamentalIngestor(BaseIngestor):
     """Ingestor for fundamental stock data."""
     
-    def __init__(self, source: str = "yahoo_finance"):
+    def __init__(self, source: str = "yahoo_finance", symbols: Optional[List[str]] = None):
         """
         Initialize fundamental ingestor.
         
         Args:
             source: Data source identifier (yahoo_finance, alpha_vantage, etc.)
+            symbols: Symbols to ingest (default: all tracked stocks)
         """
         super().__init__(source=source, ingestion_type="fundamental")
+        self.symbols = symbols if symbols is not None else settings.tracked_stocks
+        self.ticker_symbols = {symbol: f"{symbol}{NSE_SUFFIX}" for symbol in self.symbols}
         self.api_url = settings.MARKET_DATA_BASE_URL
         self.api_key = settings.MARKET_DATA_API_KEY or settings.ALPHA_VANTAGE_API_KEY
     
@@ -33,24 +58,55 @@ class FundamentalIngestor(BaseIngestor):
         Returns:
             Dictionary mapping stock symbols to their fundamental data
         """
+        log = self.logger
         all_data = {}
+        started = time.monotonic()
+        # One timestamp for the whole batch, stamped on every record (naive UTC,
+        # matching the DateTime columns)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         
-        for symbol in settings.get_tracked_stocks_list():
-            self.logger.info(f"Fetching fundamental data for {symbol}")
+        # Build all tickers in one batch so they share yfinance's HTTP session
+        tickers = (
+            yf.Tickers(" ".join(self.ticker_symbols.values())).tickers
+            if yf is not None and self.ticker_symbols else {}
+        )
+        
+        # Fetches are network-bound, so fan them out across a thread pool.
+        # Each task runs in a copy of the current context to keep the run ID.
+        with ThreadPoolExecutor(max_workers=settings.INGESTION_CONCURRENCY) as executor:
+            futures = {
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._fetch_stock_fundamentals,
+                    symbol,
+                    tickers.get(ticker_symbol.upper()),
+                    now
+                ): symbol
+                for symbol, ticker_symbol in self.ticker_symbols.items()
+            }
             
-            try:
-                # Yahoo Finance-like API pattern (adjust based on actual API)
-                # For MVP, using Alpha Vantage or Yahoo Finance alternative
-                data = self._fetch_stock_fundamentals(symbol)
-                if data:
-                    all_data[symbol] = data
-            except Exception as e:
-                self.logger.error(f"Failed to fetch data for {symbol}: {e}")
-                continue
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    data = future.result()
+                    if data:
+                        all_data[symbol] = data
+                except Exception as e:
+                    log.error(f"Failed to fetch data for {symbol}: {e}")
+                    continue
         
+        log.info(
+            "Fetched fundamentals for %d/%d symbols in %.2fs",
+            len(all_data), len(self.symbols), time.monotonic() - started
+        )
         return all_data
     
-    def _fetch_stock_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
+    def _fetch_stock_fundamentals(
+        self,
+        symbol: str,
+        ticker: Optional[Any],
+        now: datetime
+    ) -> Optional[Dict[str, Any]]:
         """
         Fetch fundamentals for a single stock.
         
@@ -62,6 +118,8 @@ class FundamentalIngestor(BaseIngestor):
         
         Args:
             symbol: Stock symbol
+            ticker: yfinance Ticker for the symbol, or None if unavailable
+            now: Batch timestamp used as the data date
             
         Returns:
             Dictionary with fundamental metrics or None
@@ -69,12 +127,11 @@ class FundamentalIngestor(BaseIngestor):
         # Placeholder implementation using yfinance concept
         # In production, replace with actual API calls
         
+        self.logger.debug("Fetching fundamental data for %s", symbol)
+        
         try:
-            import yfinance as yf
-            
-            # For Indian stocks, append .NS (NSE) or .BO (BSE)
-            ticker_symbol = f"{symbol}.NS"
-            ticker = yf.Ticker(ticker_symbol)
+            if ticker is None:
+                raise RuntimeError("No yfinance ticker available (is yfinance installed?)")
             
             info = ticker.info
             
@@ -102,7 +159,7 @@ class FundamentalIngestor(BaseIngestor):
                 "week_52_high": info.get("fiftyTwoWeekHigh"),
                 "week_52_low": info.get("fiftyTwoWeekLow"),
                 
-                "data_date": datetime.utcnow()
+                "data_date": now
             }
             
             return fundamentals
@@ -122,6 +179,7 @@ class FundamentalIngestor(BaseIngestor):
         Returns:
             Metrics dictionary
         """
+        log = self.logger
         metrics = {
             "fetched": len(data),
             "inserted": 0,
@@ -129,53 +187,63 @@ class FundamentalIngestor(BaseIngestor):
             "skipped": 0
         }
         
+        symbols = list(data.keys())
+        
+        # Resolve all stock IDs in one query
+        stock_ids = dict(
+            db.query(Stock.symbol, Stock.id).filter(Stock.symbol.in_(symbols)).all()
+        )
+        
+        # Create missing stocks in one statement (concurrent creators are ignored)
+        missing = [symbol for symbol in symbols if symbol not in stock_ids]
+        if missing:
+            db.execute(
+                pg_insert(Stock).values([
+                    {
+                        "symbol": symbol,
+                        "name": data[symbol].get("name", symbol),
+                        "exchange": "NSE"
+                    }
+                    for symbol in missing
+                ]).on_conflict_do_nothing(index_elements=[Stock.symbol])
+            )
+            stock_ids.update(
+                db.query(Stock.symbol, Stock.id).filter(Stock.symbol.in_(missing)).all()
+            )
+            log.info(f"Created {len(missing)} new stocks: {missing}")
+        
+        # Build plain rows and upsert them with a single executemany
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = []
         for symbol, fundamentals in data.items():
-            try:
-                # Get or create stock
-                stock = db.query(Stock).filter(Stock.symbol == symbol).first()
-                
-                if not stock:
-                    # Create new stock entry
-                    stock = Stock(
-                        symbol=symbol,
-                        name=fundamentals.get("name", symbol),
-                        exchange="NSE"
-                    )
-                    db.add(stock)
-                    db.flush()  # Get stock ID
-                    self.logger.info(f"Created new stock: {symbol}")
-                
-                # Create fundamental entry
-                fundamental = Fundamental(
-                    stock_id=stock.id,
-                    pe_ratio=fundamentals.get("pe_ratio"),
-                    pb_ratio=fundamentals.get("pb_ratio"),
-                    ps_ratio=fundamentals.get("ps_ratio"),
-                    dividend_yield=fundamentals.get("dividend_yield"),
-                    roe=fundamentals.get("roe"),
-                    roa=fundamentals.get("roa"),
-                    operating_margin=fundamentals.get("operating_margin"),
-                    net_margin=fundamentals.get("net_margin"),
-                    debt_to_equity=fundamentals.get("debt_to_equity"),
-                    current_ratio=fundamentals.get("current_ratio"),
-                    quick_ratio=fundamentals.get("quick_ratio"),
-                    revenue_growth=fundamentals.get("revenue_growth"),
-                    earnings_growth=fundamentals.get("earnings_growth"),
-                    current_price=fundamentals.get("current_price"),
-                    week_52_high=fundamentals.get("week_52_high"),
-                    week_52_low=fundamentals.get("week_52_low"),
-                    data_date=fundamentals.get("data_date", datetime.utcnow())
-                )
-                
-                db.add(fundamental)
-                metrics["inserted"] += 1
-                
-                self.logger.info(f"Stored fundamental data for {symbol}")
-                
-            except Exception as e:
-                self.logger.error(f"Failed to store data for {symbol}: {e}")
+            stock_id = stock_ids.get(symbol)
+            if stock_id is None:
+                log.error(f"Failed to resolve stock for {symbol}")
                 metrics["skipped"] += 1
                 continue
+            
+            row = {field: fundamentals.get(field) for field in FUNDAMENTAL_FIELDS}
+            row["stock_id"] = stock_id
+            # Key on the trading day so a same-day re-ingest updates the row
+            row["data_date"] = fundamentals.get("data_date", now).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            rows.append(row)
+        
+        if rows:
+            stmt = pg_insert(Fundamental)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Fundamental.stock_id, Fundamental.data_date],
+                set_={
+                    **{field: stmt.excluded[field] for field in FUNDAMENTAL_FIELDS},
+                    "updated_at": now,
+                }
+            ).returning(
+                # xmax is 0 for freshly inserted rows and non-zero for updated ones
+                literal_column("xmax = 0")
+            )
+            inserted = db.execute(stmt, rows).scalars().all()
+            metrics["inserted"] = sum(1 for was_inserted in inserted if was_inserted)
+            metrics["updated"] = len(inserted) - metrics["inserted"]
         
-        db.commit()
         return metrics
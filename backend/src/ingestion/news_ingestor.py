@@ -2,15 +2,185 @@
 News ingestor for stock-related news articles.
 Fetches news from configured sources and associates with relevant stocks.
 """
+import asyncio
 import hashlib
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
 import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from .base import BaseIngestor
+from .bloom import get_news_hash_filter
+from .rate_limit import TokenBucket
 from ..core.config import settings
-from ..models.database import Stock, News, NewsStock
+from ..core.stock_ids import get_stock_ids
+from ..models.database import News, NewsStock
+
+# Aho-Corasick matcher (C extension); falls back to per-symbol scans without it
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Articles stored per transaction
+NEWS_BATCH_SIZE = 500
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    Split items into tuples of at most size elements (itertools.batched on 3.12+).
+    
+    Args:
+        items: Items to split
+        size: Maximum chunk size
+        
+    Yields:
+        Consecutive chunks
+    """
+    iterator = iter(items)
+    while chunk := tuple(islice(iterator, size)):
+        yield chunk
+
+
+@lru_cache(maxsize=1)
+def _symbol_automaton(symbols: Tuple[str, ...]) -> Any:
+    """
+    Build an Aho-Corasick automaton over the tracked symbols.
+    
+    Cached on the symbol tuple, so it is rebuilt only when the list changes.
+    
+    Args:
+        symbols: Tracked stock symbols
+        
+    Returns:
+        Automaton yielding (end_index, symbol) matches
+    """
+    automaton = ahocorasick.Automaton()
+    for symbol in symbols:
+        automaton.add_word(symbol, symbol)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=1)
+def _symbol_patterns(symbols: Tuple[str, ...]) -> Tuple[Tuple[str, "re.Pattern[str]"], ...]:
+    """
+    Compile whole-word patterns for the tracked symbols (no-automaton fallback).
+    
+    Args:
+        symbols: Tracked stock symbols
+        
+    Returns:
+        (symbol, pattern) pairs matching the symbol only between non-alphanumerics
+    """
+    return tuple(
+        (symbol, re.compile(rf"(?<![^\W_]){re.escape(symbol)}(?![^\W_])"))
+        for symbol in symbols
+    )
+
+
+def _scan_symbols(
+    tracked: Tuple[str, ...],
+    title: Optional[str],
+    summary: Optional[str],
+    content: Optional[str]
+) -> FrozenSet[str]:
+    """
+    Find the tracked symbols mentioned in an article's text.
+    
+    Args:
+        tracked: Tracked stock symbols (upper-case)
+        title: Article title
+        summary: Article summary
+        content: Article content
+        
+    Returns:
+        Symbols mentioned as whole words
+    """
+    automaton = _symbol_automaton(tracked) if ahocorasick is not None and tracked else None
+    found = set()
+    
+    # Scan title, summary and content separately (short fields first) rather
+    # than upper-casing one concatenated copy, and stop once every symbol is found
+    for value in (title, summary, content):
+        if not value:
+            continue
+        text = value.upper()
+        
+        # Only whole-word matches count (so "TCS" does not match inside "TCSL")
+        if automaton is not None:
+            # Single pass over the text
+            last = len(text) - 1
+            for end, symbol in automaton.iter(text):
+                start = end - len(symbol) + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (
+                    end == last or not text[end + 1].isalnum()
+                ):
+                    found.add(symbol)
+        else:
+            for symbol, pattern in _symbol_patterns(tracked):
+                if symbol not in found and symbol in text and pattern.search(text):
+                    found.add(symbol)
+        
+        if len(found) == len(tracked):
+            break
+    
+    return frozenset(found)
+
+
+# Symbol matches per article text digest, so syndicated copies of a story
+# (same text, different URL) and reprocessed articles are only scanned once
+SYMBOL_MATCH_CACHE_SIZE = 10_000
+_symbol_matches: "OrderedDict[Tuple[Tuple[str, ...], bytes], FrozenSet[str]]" = OrderedDict()
+_symbol_matches_lock = threading.Lock()
+
+
+def _symbols_in_text(
+    tracked: Tuple[str, ...],
+    title: Optional[str],
+    summary: Optional[str],
+    content: Optional[str]
+) -> FrozenSet[str]:
+    """
+    Find the tracked symbols mentioned in an article's text, memoized.
+    
+    The cache is keyed on a digest of the text rather than the text itself,
+    so it holds a few bytes per article instead of full article bodies.
+    
+    Args:
+        tracked: Tracked stock symbols (upper-case)
+        title: Article title
+        summary: Article summary
+        content: Article content
+        
+    Returns:
+        Symbols mentioned as whole words
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for value in (title, summary, content):
+        digest.update((value or "").encode())
+        digest.update(b"\0")
+    key = (tracked, digest.digest())
+    
+    with _symbol_matches_lock:
+        found = _symbol_matches.get(key)
+        if found is not None:
+            _symbol_matches.move_to_end(key)
+            return found
+    
+    found = _scan_symbols(tracked, title, summary, content)
+    with _symbol_matches_lock:
+        _symbol_matches[key] = found
+        if len(_symbol_matches) > SYMBOL_MATCH_CACHE_SIZE:
+            _symbol_matches.popitem(last=False)
+    return found
 
 
 class NewsIngestor(BaseIngestor):
@@ -26,62 +196,128 @@ class NewsIngestor(BaseIngestor):
         super().__init__(source=source, ingestion_type="news")
         self.api_url = settings.NEWS_API_BASE_URL
         self.api_key = settings.NEWS_API_KEY
+        self.rate_limiter = TokenBucket(
+            source,
+            capacity=settings.NEWS_API_BURST,
+            refill_per_sec=settings.NEWS_API_DAILY_QUOTA / 86400
+        )
     
     def fetch_data(self) -> List[Dict[str, Any]]:
         """
         Fetch news articles related to tracked stocks.
         
+        Synchronous entry point required by BaseIngestor; runs the
+        concurrent fetch on a private event loop.
+        
+        Returns:
+            List of news article dictionaries
+        """
+        return asyncio.run(self.fetch_data_async())
+    
+    async def fetch_data_async(self) -> List[Dict[str, Any]]:
+        """
+        Fetch news for all queries concurrently over one pooled client.
+        
         Returns:
             List of news article dictionaries
         """
+        log = self.logger
         all_articles = []
         
-        # Build query for Indian stock market news
-        # Search for company names or general Indian market news
-        queries = [
+        # Build query for Indian stock market news, in priority order: tracked
+        # companies first, general market news last, so that these are the
+        # queries dropped when the quota runs short
+        queries = list(settings.tracked_stocks[:5]) + [  # Limit to avoid API quota
             "Indian stock market",
             "NSE BSE",
             "NIFTY"
-        ] + [symbol for symbol in settings.TRACKED_STOCKS[:5]]  # Limit to avoid API quota
+        ]
         
-        for query in queries:
-            self.logger.info(f"Fetching news for query: {query}")
-            
-            try:
-                articles = self._fetch_news_for_query(query)
-                if articles:
-                    all_articles.extend(articles)
-            except Exception as e:
-                self.logger.error(f"Failed to fetch news for query '{query}': {e}")
-                continue
+        if not self.api_key:
+            log.warning("News API key not configured, using mock data")
+            for query in queries:
+                all_articles.extend(self._generate_mock_news(query))
+        else:
+            all_articles.extend(await self._fetch_all_queries(queries))
         
         # Deduplicate by URL
         unique_articles = {article["url"]: article for article in all_articles}
         
-        self.logger.info(f"Fetched {len(unique_articles)} unique articles")
+        log.info(f"Fetched {len(unique_articles)} unique articles")
         return list(unique_articles.values())
     
-    def _fetch_news_for_query(self, query: str) -> List[Dict[str, Any]]:
+    async def _fetch_all_queries(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch all queries concurrently over one pooled client.
+        
+        Args:
+            queries: Search queries
+            
+        Returns:
+            Articles from every query that succeeded
+        """
+        log = self.logger
+        
+        # Fetch news from last 24 hours (one window for every query)
+        from_date = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
+        concurrency = settings.INGESTION_CONCURRENCY
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        ) as client:
+            # Start each query once the shared quota allows it, in priority order
+            tasks = []
+            for query in queries:
+                if not await self.rate_limiter.acquire(max_wait=settings.NEWS_API_MAX_WAIT_SECONDS):
+                    log.warning(
+                        f"News API quota exhausted, skipping {len(queries) - len(tasks)} queries"
+                    )
+                    break
+                tasks.append(asyncio.create_task(
+                    self._fetch_news_for_query(client, query, from_date, semaphore)
+                ))
+            
+            # One failed query must not abort the rest of the batch
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        fetched = []
+        for query, articles in zip(queries, results):
+            if isinstance(articles, Exception):
+                log.error(f"Failed to fetch news for query '{query}': {articles}")
+                continue
+            if articles:
+                fetched.extend(articles)
+        
+        return fetched
+    
+    async def _fetch_news_for_query(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        from_date: str,
+        semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
         """
         Fetch news articles for a specific query.
         
         Args:
+            client: Shared async HTTP client
             query: Search query
+            from_date: ISO timestamp of the oldest article to fetch
+            semaphore: Bounds the number of in-flight requests
             
         Returns:
             List of articles
         """
-        if not self.api_key:
-            self.logger.warning("News API key not configured, using mock data")
-            return self._generate_mock_news(query)
+        self.logger.debug("Fetching news for query: %s", query)
         
         try:
             # NewsAPI endpoint
             url = f"{self.api_url}/everything"
             
-            # Fetch news from last 24 hours
-            from_date = (datetime.utcnow() - timedelta(hours=24)).isoformat()
-            
             params = {
                 "q": query,
                 "from": from_date,
@@ -90,28 +326,35 @@ class NewsIngestor(BaseIngestor):
                 "apiKey": self.api_key
             }
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                articles = data.get("articles", [])
-                
-                # Transform to internal format
-                transformed = []
-                for article in articles:
-                    transformed.append({
-                        "title": article.get("title"),
-                        "content": article.get("content") or article.get("description"),
-                        "summary": article.get("description"),
-                        "url": article.get("url"),
-                        "source": article.get("source", {}).get("name"),
-                        "author": article.get("author"),
-                        "published_at": article.get("publishedAt"),
-                        "query": query  # Track which query found this article
-                    })
-                
-                return transformed
+            async with semaphore:
+                response = await client.get(url, params=params)
+            
+            if response.status_code == 429:
+                # Hold every worker off for as long as the provider asks
+                retry_after = response.headers.get("Retry-After", "")
+                await self.rate_limiter.penalize(
+                    float(retry_after) if retry_after.isdigit() else 60.0
+                )
+            response.raise_for_status()
+            
+            data = response.json()
+            articles = data.get("articles", [])
+            
+            # Transform to internal format
+            transformed = []
+            for article in articles:
+                transformed.append({
+                    "title": article.get("title"),
+                    "content": article.get("content") or article.get("description"),
+                    "summary": article.get("description"),
+                    "url": article.get("url"),
+                    "source": article.get("source", {}).get("name"),
+                    "author": article.get("author"),
+                    "published_at": article.get("publishedAt"),
+                    "query": query  # Track which query found this article
+                })
+            
+            return transformed
         
         except Exception as e:
             self.logger.error(f"Error fetching news from API: {e}")
@@ -127,15 +370,16 @@ class NewsIngestor(BaseIngestor):
         Returns:
             List of mock articles
         """
+        now = datetime.now(timezone.utc)
         return [
             {
                 "title": f"{query} shows strong performance in Q4",
                 "content": f"Latest analysis shows {query} demonstrating robust growth...",
                 "summary": f"{query} Q4 performance summary",
-                "url": f"https://example.com/news/{query.replace(' ', '-').lower()}-{int(datetime.utcnow().timestamp())}",
+                "url": f"https://example.com/news/{query.replace(' ', '-').lower()}-{int(now.timestamp())}",
                 "source": "Mock Financial Times",
                 "author": "Test Author",
-                "published_at": datetime.utcnow().isoformat(),
+                "published_at": now.isoformat(),
                 "query": query
             }
         ]
@@ -150,26 +394,25 @@ class NewsIngestor(BaseIngestor):
         Returns:
             List of stock symbols mentioned in the article
         """
-        mentioned_symbols = []
-        
-        # Search for tracked stock symbols in title and content
-        text = f"{article.get('title', '')} {article.get('content', '')} {article.get('summary', '')}".upper()
-        
-        for symbol in settings.TRACKED_STOCKS:
-            if symbol in text:
-                mentioned_symbols.append(symbol)
+        tracked = settings.tracked_stocks  # Already upper-cased by settings
+        found = set(_symbols_in_text(
+            tracked, article.get("title"), article.get("summary"), article.get("content")
+        ))
         
         # Also check if query was a stock symbol
-        query = article.get("query", "").upper()
-        if query in settings.TRACKED_STOCKS and query not in mentioned_symbols:
-            mentioned_symbols.append(query)
+        query = (article.get("query") or "").upper()
+        if query in tracked:
+            found.add(query)
         
-        return mentioned_symbols
+        return [symbol for symbol in tracked if symbol in found]
     
     def process_data(self, data: List[Dict[str, Any]], db: Session) -> Dict[str, int]:
         """
         Process and store news articles.
         
+        Articles are stored in chunks of NEWS_BATCH_SIZE, each committed on its
+        own, which bounds transaction size and keeps progress on failure.
+        
         Args:
             data: List of news articles
             db: Database session
@@ -183,66 +426,130 @@ class NewsIngestor(BaseIngestor):
             "updated": 0,
             "skipped": 0
         }
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         
-        for article in data:
-            try:
-                # Compute content hash for idempotency
-                content_str = f"{article['url']}{article['title']}"
-                content_hash = hashlib.sha256(content_str.encode()).hexdigest()
-                
-                # Check if article already exists
-                existing = db.query(News).filter(News.content_hash == content_hash).first()
-                if existing:
-                    metrics["skipped"] += 1
-                    continue
-                
-                # Extract relevant stocks
-                stock_symbols = self._extract_stock_symbols(article)
-                
-                if not stock_symbols:
-                    # Skip articles not related to any tracked stocks
-                    metrics["skipped"] += 1
-                    continue
-                
-                # Parse published date
-                published_at = article.get("published_at")
-                if isinstance(published_at, str):
-                    published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                elif not published_at:
-                    published_at = datetime.utcnow()
-                
-                # Create news entry
-                news = News(
-                    title=article.get("title", "")[:500],
-                    content=article.get("content"),
-                    summary=article.get("summary"),
-                    url=article.get("url"),
-                    source=article.get("source"),
-                    author=article.get("author"),
-                    published_at=published_at,
-                    content_hash=content_hash
-                )
-                
-                db.add(news)
-                db.flush()  # Get news ID
-                
-                # Associate with stocks
-                for symbol in stock_symbols:
-                    stock = db.query(Stock).filter(Stock.symbol == symbol).first()
-                    if stock:
-                        news_stock = NewsStock(
-                            news_id=news.id,
-                            stock_id=stock.id
-                        )
-                        db.add(news_stock)
-                
-                metrics["inserted"] += 1
-                self.logger.info(f"Stored news article: {news.title[:50]}... (stocks: {stock_symbols})")
-                
-            except Exception as e:
-                self.logger.error(f"Failed to store article: {e}")
+        for chunk in _batched(data, NEWS_BATCH_SIZE):
+            self._process_chunk(chunk, db, metrics, now)
+            db.commit()
+            db.expire_all()
+        
+        return metrics
+    
+    def _process_chunk(
+        self,
+        articles: Sequence[Dict[str, Any]],
+        db: Session,
+        metrics: Dict[str, int],
+        now: datetime
+    ) -> None:
+        """
+        Store one chunk of news articles, accumulating into metrics.
+        
+        Args:
+            articles: Chunk of news articles
+            db: Database session
+            metrics: Run metrics, updated in place
+            now: Fallback publish time for undated articles
+        """
+        # Bind hot-loop lookups to locals once
+        log = self.logger
+        
+        # Build rows in Python first, keyed by content hash for idempotency
+        pending: Dict[str, Dict[str, Any]] = {}
+        article_symbols: Dict[str, List[str]] = {}
+        for article in articles:
+            # NewsAPI regularly sends articles without a URL or title; skip
+            # them with a branch rather than raising and catching per article
+            url = article.get("url")
+            title = article.get("title")
+            if not url or not title:
                 metrics["skipped"] += 1
                 continue
+            
+            # Idempotency key only, not a security boundary
+            content_hash = hashlib.sha256(
+                f"{url}{title}".encode(), usedforsecurity=False
+            ).hexdigest()
+            if content_hash in pending:
+                metrics["skipped"] += 1
+                continue
+            
+            # Extract relevant stocks
+            stock_symbols = self._extract_stock_symbols(article)
+            
+            if not stock_symbols:
+                # Skip articles not related to any tracked stocks
+                metrics["skipped"] += 1
+                continue
+            
+            # Parse published date
+            published_at = article.get("published_at")
+            if isinstance(published_at, str):
+                try:
+                    published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+                    # Store naive UTC, matching the DateTime columns
+                    if published_at.tzinfo is not None:
+                        published_at = published_at.astimezone(timezone.utc).replace(tzinfo=None)
+                except ValueError:
+                    log.warning(f"Skipping article with invalid publish date: {published_at!r}")
+                    metrics["skipped"] += 1
+                    continue
+            elif not published_at:
+                published_at = now
+            
+            pending[content_hash] = {
+                "title": title[:500],
+                "content": article.get("content"),
+                "summary": article.get("summary"),
+                "url": url,
+                "source": article.get("source"),
+                "author": article.get("author"),
+                "published_at": published_at,
+                "content_hash": content_hash
+            }
+            article_symbols[content_hash] = stock_symbols
         
-        db.commit()
-        return metrics
+        if not pending:
+            return
+        
+        # Drop articles that are already stored. Only hashes the Bloom filter
+        # may have seen need a database check; the rest are certainly new.
+        seen_hashes = get_news_hash_filter(db)
+        candidates = [content_hash for content_hash in pending if content_hash in seen_hashes]
+        if candidates:
+            existing = db.execute(
+                select(News.content_hash).where(News.content_hash.in_(candidates))
+            ).scalars().all()
+            for content_hash in existing:
+                del pending[content_hash]
+            metrics["skipped"] += len(existing)
+        
+        if not pending:
+            return
+        
+        # Insert the batch; rows raced in by a concurrent run are ignored
+        inserted = db.execute(
+            pg_insert(News).on_conflict_do_nothing().returning(News.id, News.content_hash),
+            list(pending.values())
+        ).all()
+        metrics["inserted"] += len(inserted)
+        metrics["skipped"] += len(pending) - len(inserted)
+        seen_hashes.update(content_hash for _, content_hash in inserted)
+        
+        # Resolve mentioned symbols (cached in-process; unknown ones in a
+        # single query) and link them in one statement
+        stock_ids = get_stock_ids(
+            db, {symbol for content_hash in pending for symbol in article_symbols[content_hash]}
+        )
+        links = [
+            {"news_id": news_id, "stock_id": stock_ids[symbol]}
+            for news_id, content_hash in inserted
+            for symbol in article_symbols[content_hash]
+            if symbol in stock_ids
+        ]
+        if links:
+            db.execute(pg_insert(NewsStock).on_conflict_do_nothing(), links)
+        
+        log.debug(
+            "Stored %d news articles with %d stock links", len(inserted), len(links)
+        )
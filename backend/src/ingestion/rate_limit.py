@@ -0,0 +1,118 @@
+"""
+Redis-backed token bucket for pacing calls to quota-limited data providers.
+Shared by every worker process, so concurrent runs draw from one budget.
+"""
+import asyncio
+from typing import Any, Optional
+
+from ..core.logging import get_logger
+from ..core.redis_client import get_redis
+
+logger = get_logger(__name__)
+
+RATE_LIMIT_KEY = "ingestion:ratelimit:{source}"
+
+# Refill and take atomically. Time comes from the Redis server so every worker
+# agrees on it; the wait is returned as a string because Lua numbers are
+# truncated to integers in replies.
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local force = ARGV[4] == '1'
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if force then
+    tokens = math.min(tokens, 0) - cost
+elseif tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket whose state lives in Redis.
+    
+    Fails open: if Redis is unavailable, calls are not throttled.
+    """
+    
+    def __init__(self, source: str, capacity: float, refill_per_sec: float):
+        """
+        Initialize the bucket.
+        
+        Args:
+            source: Provider identifier, used in the Redis key
+            capacity: Maximum burst size in tokens
+            refill_per_sec: Tokens added per second
+        """
+        self.key = RATE_LIMIT_KEY.format(source=source)
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._script: Optional[Any] = None
+    
+    def _take(self, cost: float, force: bool = False) -> float:
+        """
+        Take tokens if available.
+        
+        Args:
+            cost: Tokens to take
+            force: Empty the bucket and go cost tokens into debt
+        
+        Returns:
+            Seconds until enough tokens are available; 0 if they were taken
+        """
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(_TAKE_SCRIPT)
+            wait = self._script(
+                keys=[self.key],
+                args=[self.capacity, self.refill_per_sec, cost, int(force)]
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable for {self.key}: {e}")
+            return 0.0
+        return float(wait)
+    
+    async def acquire(self, cost: float = 1, max_wait: float = 0) -> bool:
+        """
+        Wait for tokens, giving up if they will not arrive within max_wait.
+        
+        Args:
+            cost: Tokens to take
+            max_wait: Longest time to wait in seconds
+        
+        Returns:
+            True if the tokens were taken
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        
+        while True:
+            wait = await asyncio.to_thread(self._take, cost)
+            if not wait:
+                return True
+            if loop.time() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+    
+    async def penalize(self, seconds: float) -> None:
+        """
+        Put the bucket in debt so no tokens are handed out for seconds.
+        
+        Used when the provider answers 429 with a Retry-After.
+        
+        Args:
+            seconds: Time the provider asked us to back off
+        """
+        await asyncio.to_thread(self._take, seconds * self.refill_per_sec, True)
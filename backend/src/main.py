@@ -2,19 +2,29 @@
 FastAPI main application.
 Initializes the API, middleware, and routes.
 """
+import asyncio
+import time
+from typing import Optional, Tuple
+
+import anyio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .core.config import settings
 from .core.logging import setup_logging, get_logger, set_request_id
 from .core.database import check_db_connection
 from .core.redis_client import redis_client
+from .core.cache import init_cache, stable_etag_middleware
 
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
 
+# Last health probe as (monotonic timestamp, database healthy, redis healthy)
+_last_health: Optional[Tuple[float, bool, bool]] = None
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -22,6 +32,7 @@ app = FastAPI(
     description="Personal Stock Screener with Sentiment Analysis for Indian Equities",
     docs_url="/docs" if settings.DEBUG else None,  # Disable docs in production
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,  # orjson serializes large payloads much faster
 )
 
 # Configure CORS
@@ -33,36 +44,74 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Content-based ETags for cached responses; registered before GZip so it
+# hashes the uncompressed body
+app.middleware("http")(stable_etag_middleware)
+
+# Compress list payloads (stocks, screens, rankings) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 
 @app.middleware("http")
 async def add_request_id_middleware(request, call_next):
     """Add request ID to all requests for tracing."""
-    request_id = request.headers.get("X-Request-ID")
-    set_request_id(request_id)
+    # Keep health probes cheap; they need no correlation ID
+    if request.url.path == "/health":
+        return await call_next(request)
+    
+    request_id = set_request_id(request.headers.get("X-Request-ID"))
     
     response = await call_next(request)
-    response.headers["X-Request-ID"] = set_request_id()
+    response.headers["X-Request-ID"] = request_id
     
     return response
 
 
+async def check_dependencies() -> Tuple[bool, bool]:
+    """
+    Probe the database and Redis concurrently.
+    
+    Both checks are blocking, so they run in worker threads to keep the
+    event loop free.
+    
+    Returns:
+        Tuple of (database healthy, redis healthy)
+    """
+    db_healthy, redis_healthy = await asyncio.gather(
+        asyncio.to_thread(check_db_connection),
+        asyncio.to_thread(redis_client.check_connection),
+    )
+    return db_healthy, redis_healthy
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     
+    # Sync route handlers run in anyio's worker threads (40 by default); size
+    # that pool to the DB connection pool so neither side starves the other
+    db_capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    anyio.to_thread.current_default_thread_limiter().total_tokens = db_capacity
+    logger.info(f"Request thread pool: {db_capacity} workers")
+    
+    db_healthy, redis_healthy = await check_dependencies()
+    
     # Check database connection
-    if check_db_connection():
+    if db_healthy:
         logger.info("Database connection verified")
     else:
         logger.error("Database connection failed!")
     
     # Check Redis connection
-    if redis_client.check_connection():
+    if redis_healthy:
         logger.info("Redis connection verified")
     else:
         logger.warning("Redis connection failed!")
+    
+    # Initialize response cache
+    init_cache()
 
 
 @app.on_event("shutdown")
@@ -85,9 +134,15 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    """Health check endpoint."""
-    db_healthy = check_db_connection()
-    redis_healthy = redis_client.check_connection()
+    """Health check endpoint; probe results are reused for a couple of seconds."""
+    global _last_health
+    
+    now = time.monotonic()
+    if _last_health is not None and now - _last_health[0] < settings.HEALTH_CHECK_CACHE_SECONDS:
+        _, db_healthy, redis_healthy = _last_health
+    else:
+        db_healthy, redis_healthy = await check_dependencies()
+        _last_health = (now, db_healthy, redis_healthy)
     
     status = "healthy" if (db_healthy and redis_healthy) else "unhealthy"
     status_code = 200 if status == "healthy" else 503
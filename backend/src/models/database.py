@@ -3,29 +3,30 @@ Database models using SQLAlchemy ORM.
 Defines tables for stocks, fundamentals, news, sentiment, scores, and alerts.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, Boolean, 
-    Text, ForeignKey, Index, UniqueConstraint, JSON
+    Integer, String, Float, DateTime, Boolean, 
+    Text, ForeignKey, Index, UniqueConstraint
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """Declarative base for all models."""
 
 
 class User(Base):
     """User model for authentication and profile management."""
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
-    full_name = Column(String, nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    email: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String, nullable=False)
+    full_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
 class Stock(Base):
@@ -33,23 +34,27 @@ class Stock(Base):
     
     __tablename__ = "stocks"
     
-    id = Column(Integer, primary_key=True, index=True)
-    symbol = Column(String(20), unique=True, nullable=False, index=True)
-    name = Column(String(200), nullable=False)
-    sector = Column(String(100), index=True)
-    industry = Column(String(100))
-    market_cap = Column(Float)  # In crores
-    exchange = Column(String(10), default="NSE")  # NSE/BSE
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    symbol: Mapped[str] = mapped_column(String(20), unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    sector: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    industry: Mapped[Optional[str]] = mapped_column(String(100))
+    market_cap: Mapped[Optional[float]] = mapped_column(Float, index=True)  # In crores
+    exchange: Mapped[Optional[str]] = mapped_column(String(10), default="NSE")  # NSE/BSE
     
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    fundamentals = relationship("Fundamental", back_populates="stock", cascade="all, delete-orphan")
-    news = relationship("News", secondary="news_stocks", back_populates="stocks")
-    sentiment_scores = relationship("SentimentScore", back_populates="stock", cascade="all, delete-orphan")
-    composite_scores = relationship("CompositeScore", back_populates="stock", cascade="all, delete-orphan")
+    fundamentals: Mapped[List["Fundamental"]] = relationship("Fundamental", back_populates="stock", cascade="all, delete-orphan")
+    news: Mapped[List["News"]] = relationship("News", secondary="news_stocks", back_populates="stocks")
+    sentiment_scores: Mapped[List["SentimentScore"]] = relationship("SentimentScore", back_populates="stock", cascade="all, delete-orphan")
+    composite_scores: Mapped[List["CompositeScore"]] = relationship("CompositeScore", back_populates="stock", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("idx_stock_active_sector", "sector", postgresql_where=is_active == True),
+    )
     
     def __repr__(self):
         return f"<Stock {self.symbol} - {self.name}>"
@@ -60,45 +65,47 @@ class Fundamental(Base):
     
     __tablename__ = "fundamentals"
     
-    id = Column(Integer, primary_key=True, index=True)
-    stock_id = Column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    stock_id: Mapped[int] = mapped_column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
     
     # Valuation Ratios
-    pe_ratio = Column(Float)  # Price to Earnings
-    pb_ratio = Column(Float)  # Price to Book
-    ps_ratio = Column(Float)  # Price to Sales
-    dividend_yield = Column(Float)
+    pe_ratio: Mapped[Optional[float]] = mapped_column(Float, index=True)  # Price to Earnings
+    pb_ratio: Mapped[Optional[float]] = mapped_column(Float, index=True)  # Price to Book
+    ps_ratio: Mapped[Optional[float]] = mapped_column(Float)  # Price to Sales
+    dividend_yield: Mapped[Optional[float]] = mapped_column(Float)
     
     # Profitability Metrics
-    roe = Column(Float)  # Return on Equity
-    roa = Column(Float)  # Return on Assets
-    operating_margin = Column(Float)
-    net_margin = Column(Float)
+    roe: Mapped[Optional[float]] = mapped_column(Float, index=True)  # Return on Equity
+    roa: Mapped[Optional[float]] = mapped_column(Float)  # Return on Assets
+    operating_margin: Mapped[Optional[float]] = mapped_column(Float)
+    net_margin: Mapped[Optional[float]] = mapped_column(Float)
     
     # Financial Health
-    debt_to_equity = Column(Float)
-    current_ratio = Column(Float)
-    quick_ratio = Column(Float)
+    debt_to_equity: Mapped[Optional[float]] = mapped_column(Float, index=True)
+    current_ratio: Mapped[Optional[float]] = mapped_column(Float)
+    quick_ratio: Mapped[Optional[float]] = mapped_column(Float)
     
     # Growth Metrics
-    revenue_growth = Column(Float)  # YoY %
-    earnings_growth = Column(Float)  # YoY %
+    revenue_growth: Mapped[Optional[float]] = mapped_column(Float)  # YoY %
+    earnings_growth: Mapped[Optional[float]] = mapped_column(Float)  # YoY %
     
     # Price Information
-    current_price = Column(Float)
-    week_52_high = Column(Float)
-    week_52_low = Column(Float)
+    current_price: Mapped[Optional[float]] = mapped_column(Float)
+    week_52_high: Mapped[Optional[float]] = mapped_column(Float)
+    week_52_low: Mapped[Optional[float]] = mapped_column(Float)
     
     # Metadata
-    data_date = Column(DateTime, nullable=False)  # Date of the financial data
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    data_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # Date of the financial data
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship
-    stock = relationship("Stock", back_populates="fundamentals")
+    stock: Mapped["Stock"] = relationship("Stock", back_populates="fundamentals")
     
     __table_args__ = (
-        Index("idx_stock_data_date", "stock_id", "data_date"),
+        # Unique so ingestion can upsert on (stock_id, data_date); data_date is
+        # truncated to the trading day, so there is one row per stock per day
+        Index("idx_stock_data_date", stock_id, data_date.desc(), unique=True),
     )
     
     def __repr__(self):
@@ -110,23 +117,28 @@ class News(Base):
     
     __tablename__ = "news"
     
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(500), nullable=False)
-    content = Column(Text)
-    summary = Column(Text)
-    url = Column(String(1000), unique=True, nullable=False)
-    source = Column(String(100))  # News source name
-    author = Column(String(200))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    content: Mapped[Optional[str]] = mapped_column(Text)
+    summary: Mapped[Optional[str]] = mapped_column(Text)
+    url: Mapped[str] = mapped_column(String(1000), unique=True, nullable=False)
+    source: Mapped[Optional[str]] = mapped_column(String(100))  # News source name
+    author: Mapped[Optional[str]] = mapped_column(String(200))
     
-    published_at = Column(DateTime, nullable=False, index=True)
-    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    published_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
-    # Hash for idempotency check
-    content_hash = Column(String(64), unique=True, nullable=False, index=True)
+    # Hash for idempotency check (unique via the covering index below)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     
     # Relationships
-    stocks = relationship("Stock", secondary="news_stocks", back_populates="news")
-    sentiment_scores = relationship("SentimentScore", back_populates="news", cascade="all, delete-orphan")
+    stocks: Mapped[List["Stock"]] = relationship("Stock", secondary="news_stocks", back_populates="news")
+    sentiment_scores: Mapped[List["SentimentScore"]] = relationship("SentimentScore", back_populates="news", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Covering index: hash lookups that need the ID are index-only scans
+        Index("ix_news_content_hash_covering", content_hash, unique=True, postgresql_include=["id"]),
+    )
     
     def __repr__(self):
         return f"<News {self.title[:50]}...>"
@@ -137,11 +149,11 @@ class NewsStock(Base):
     
     __tablename__ = "news_stocks"
     
-    id = Column(Integer, primary_key=True)
-    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), nullable=False)
-    stock_id = Column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    news_id: Mapped[int] = mapped_column(Integer, ForeignKey("news.id", ondelete="CASCADE"), nullable=False)
+    stock_id: Mapped[int] = mapped_column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
     
     __table_args__ = (
         UniqueConstraint("news_id", "stock_id", name="uq_news_stock"),
@@ -154,27 +166,29 @@ class SentimentScore(Base):
     
     __tablename__ = "sentiment_scores"
     
-    id = Column(Integer, primary_key=True, index=True)
-    news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), nullable=False)
-    stock_id = Column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    news_id: Mapped[int] = mapped_column(Integer, ForeignKey("news.id", ondelete="CASCADE"), nullable=False)
+    stock_id: Mapped[int] = mapped_column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
     
     # Sentiment Analysis Results
-    sentiment_label = Column(String(20), nullable=False)  # positive/negative/neutral
-    sentiment_score = Column(Float, nullable=False)  # -1 to +1
-    confidence = Column(Float)  # 0 to 1
+    sentiment_label: Mapped[str] = mapped_column(String(20), nullable=False)  # positive/negative/neutral
+    sentiment_score: Mapped[float] = mapped_column(Float, nullable=False)  # -1 to +1
+    confidence: Mapped[Optional[float]] = mapped_column(Float)  # 0 to 1
     
     # Model Information
-    model_name = Column(String(100))
-    model_version = Column(String(50))
+    model_name: Mapped[Optional[str]] = mapped_column(String(100))
+    model_version: Mapped[Optional[str]] = mapped_column(String(50))
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    news = relationship("News", back_populates="sentiment_scores")
-    stock = relationship("Stock", back_populates="sentiment_scores")
+    news: Mapped["News"] = relationship("News", back_populates="sentiment_scores")
+    stock: Mapped["Stock"] = relationship("Stock", back_populates="sentiment_scores")
     
     __table_args__ = (
-        Index("idx_sentiment_stock_created", "stock_id", "created_at"),
+        Index("idx_sentiment_stock_created", stock_id, created_at.desc()),
+        # Serves the "not yet analyzed" anti-join and ON DELETE CASCADE from news
+        Index("idx_sentiment_news_id", news_id),
     )
     
     def __repr__(self):
@@ -186,66 +200,101 @@ class CompositeScore(Base):
     
     __tablename__ = "composite_scores"
     
-    id = Column(Integer, primary_key=True, index=True)
-    stock_id = Column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    stock_id: Mapped[int] = mapped_column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), nullable=False)
     
     # Individual Scores (0-100)
-    fundamental_score = Column(Float, nullable=False)
-    sentiment_score = Column(Float, nullable=False)
+    fundamental_score: Mapped[float] = mapped_column(Float, nullable=False)
+    sentiment_score: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Composite Score (weighted average, 0-100)
-    composite_score = Column(Float, nullable=False, index=True)
+    composite_score: Mapped[float] = mapped_column(Float, nullable=False, index=True)
     
     # Ranking
-    rank = Column(Integer, index=True)
+    rank: Mapped[Optional[int]] = mapped_column(Integer, index=True)
     
-    # Explainability - JSON field with score breakdown
-    score_breakdown = Column(JSON)
+    # Explainability - JSONB field with score breakdown
+    score_breakdown: Mapped[Optional[Any]] = mapped_column(JSONB)
     
     # Metadata
-    score_date = Column(DateTime, nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    score_date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationship
-    stock = relationship("Stock", back_populates="composite_scores")
+    stock: Mapped["Stock"] = relationship("Stock", back_populates="composite_scores")
     
     __table_args__ = (
         Index("idx_composite_score_date", "composite_score", "score_date"),
-        Index("idx_stock_score_date", "stock_id", "score_date"),
+        Index("idx_stock_score_date", stock_id, score_date.desc()),
+        # Matches get_top_stocks' ORDER BY, so the top N are read in index order
+        Index("idx_score_date_rank", score_date.desc(), rank),
     )
     
     def __repr__(self):
         return f"<CompositeScore stock_id={self.stock_id} score={self.composite_score} rank={self.rank}>"
 
 
+class LatestCompositeScore(Base):
+    """
+    Latest composite score per stock.
+    
+    Read-only mapping of the mv_latest_composite_scores materialized view,
+    refreshed after each scoring run. Created by init_db, not create_all.
+    """
+    
+    __tablename__ = "mv_latest_composite_scores"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    stock_id: Mapped[int] = mapped_column(Integer, ForeignKey("stocks.id"), nullable=False)
+    
+    fundamental_score: Mapped[float] = mapped_column(Float, nullable=False)
+    sentiment_score: Mapped[float] = mapped_column(Float, nullable=False)
+    composite_score: Mapped[float] = mapped_column(Float, nullable=False)
+    rank: Mapped[Optional[int]] = mapped_column(Integer)
+    score_breakdown: Mapped[Optional[Any]] = mapped_column(JSONB)
+    
+    score_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    
+    __table_args__ = {"info": {"is_view": True}}
+    
+    def __repr__(self):
+        return f"<LatestCompositeScore stock_id={self.stock_id} score={self.composite_score}>"
+
+
 class Alert(Base):
     """User-defined alert rules."""
     
     __tablename__ = "alerts"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Alert Configuration
-    name = Column(String(200), nullable=False)
-    description = Column(Text)
-    alert_type = Column(String(50), nullable=False)  # score_threshold, sentiment_change, price_change
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    alert_type: Mapped[str] = mapped_column(String(50), nullable=False)  # score_threshold, sentiment_change, price_change
     
-    # Conditions (JSON)
-    conditions = Column(JSON, nullable=False)
+    # Conditions (JSONB)
+    conditions: Mapped[Any] = mapped_column(JSONB, nullable=False)
     
     # Target stocks (null = all stocks)
-    stock_symbols = Column(JSON)  # List of symbols or null for all
+    stock_symbols: Mapped[Optional[Any]] = mapped_column(JSONB)  # List of symbols or null for all
     
     # Notification
-    notification_channels = Column(JSON)  # email, webhook, etc.
-    notification_config = Column(JSON)
+    notification_channels: Mapped[Optional[Any]] = mapped_column(JSONB)  # email, webhook, etc.
+    notification_config: Mapped[Optional[Any]] = mapped_column(JSONB)
     
     # Status
-    is_active = Column(Boolean, default=True)
-    last_triggered_at = Column(DateTime)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    last_triggered_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        # Supports containment lookups, e.g. stock_symbols @> '["RELIANCE"]'
+        Index("ix_alerts_stock_symbols", stock_symbols, postgresql_using="gin"),
+    )
     
     def __repr__(self):
         return f"<Alert {self.name} type={self.alert_type}>"
@@ -256,34 +305,38 @@ class IngestionLog(Base):
     
     __tablename__ = "ingestion_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     
     # Ingestion metadata
-    ingestion_type = Column(String(50), nullable=False, index=True)  # fundamental/news
-    source = Column(String(100), nullable=False)
+    ingestion_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # fundamental/news
+    source: Mapped[str] = mapped_column(String(100), nullable=False)
     
     # Idempotency key (hash of source data)
-    data_hash = Column(String(64), nullable=False, index=True)
+    data_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     
     # Status
-    status = Column(String(20), nullable=False)  # success/failed/partial
-    error_message = Column(Text)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # success/failed/partial
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
     
     # Metrics
-    records_fetched = Column(Integer, default=0)
-    records_inserted = Column(Integer, default=0)
-    records_updated = Column(Integer, default=0)
-    records_skipped = Column(Integer, default=0)
+    records_fetched: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    records_inserted: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    records_updated: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    records_skipped: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # Timing
-    started_at = Column(DateTime, nullable=False)
-    completed_at = Column(DateTime)
-    duration_seconds = Column(Float)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    duration_seconds: Mapped[Optional[float]] = mapped_column(Float)
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
     __table_args__ = (
-        Index("idx_ingestion_type_hash", "ingestion_type", "data_hash"),
+        # Only successful runs are consulted by the idempotency check
+        Index(
+            "idx_ingestion_type_hash_success", "ingestion_type", "data_hash",
+            postgresql_where=status == "success"
+        ),
         Index("idx_ingestion_created", "ingestion_type", "created_at"),
     )
     
@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
+from ..core.config import settings
+
 
 # ============================================================================
 # Stock Schemas
@@ -238,9 +240,13 @@ class ScreeningFilters(BaseModel):
     sentiment_score_min: Optional[float] = Field(None, ge=0, le=100)
     composite_score_min: Optional[float] = Field(None, ge=0, le=100)
     
-    # Pagination
+    # Pagination: pass next_cursor from the previous page to continue after
+    # it (keyset); offset is kept for compatibility, bounded so a request can
+    # never ask Postgres to scan and discard an arbitrary number of rows, and
+    # ignored with a cursor
     limit: int = Field(default=50, ge=1, le=500)
-    offset: int = Field(default=0, ge=0)
+    offset: int = Field(default=0, ge=0, le=settings.MAX_PAGE_OFFSET)
+    cursor: Optional[str] = None
     
     # Sorting
     sort_by: str = Field(default="composite_score")
@@ -259,6 +265,7 @@ class ScreeningResponse(BaseModel):
     total_count: int
     results: List[StockWithScore]
     filters_applied: ScreeningFilters
+    next_cursor: Optional[str] = None
 
 
 # ============================================================================
@@ -2,16 +2,21 @@
 Composite scoring engine.
 Combines fundamental and sentiment scores into final ranking.
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, insert, select, update
 
 from ..core.config import settings
+from ..core.database import get_db_context
 from ..core.logging import get_logger
 from ..models.database import Stock, Fundamental, CompositeScore
 from .fundamental_scorer import FundamentalScorer
-from ..sentiment.analyzer import SentimentAnalyzer
+from ..sentiment.analyzer import get_sentiment_analyzer, summarize_sentiment
+
+# Look-back window for the sentiment component
+SENTIMENT_WINDOW_DAYS = 30
 
 
 logger = get_logger(__name__)
@@ -28,7 +33,7 @@ class CompositeScorer:
         """Initialize composite scorer."""
         self.logger = get_logger(self.__class__.__name__)
         self.fundamental_scorer = FundamentalScorer()
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer = get_sentiment_analyzer()
         
         # Get weights from config
         self.fundamental_weight = settings.FUNDAMENTAL_WEIGHT
@@ -38,15 +43,26 @@ class CompositeScorer:
         self,
         stock_id: int,
         db: Session,
-        score_date: Optional[datetime] = None
+        score_date: Optional[datetime] = None,
+        stock: Optional[Stock] = None,
+        latest_fundamental: Optional[Fundamental] = None,
+        sentiment_result: Optional[Dict[str, Any]] = None,
+        fundamental_result: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Compute composite score for a stock.
         
+        Inputs not passed in are loaded from the database; bulk scoring
+        preloads them for every stock at once.
+        
         Args:
             stock_id: Stock ID
             db: Database session
             score_date: Date of scoring (default: now)
+            stock: Preloaded stock entity
+            latest_fundamental: Preloaded latest fundamental data
+            sentiment_result: Preloaded aggregated sentiment data
+            fundamental_result: Precomputed fundamental score of latest_fundamental
             
         Returns:
             Composite score data or None if insufficient data
@@ -54,30 +70,43 @@ class CompositeScorer:
         if score_date is None:
             score_date = datetime.utcnow()
         
-        stock = db.query(Stock).get(stock_id)
-        if not stock:
-            self.logger.error(f"Stock {stock_id} not found")
-            return None
-        
-        # Get latest fundamental data
-        latest_fundamental = db.query(Fundamental).filter(
-            Fundamental.stock_id == stock_id
-        ).order_by(desc(Fundamental.data_date)).first()
+        if stock is None:
+            # Stock and its latest fundamental data in one round trip
+            row = db.query(Stock, Fundamental).outerjoin(
+                Fundamental, Fundamental.stock_id == Stock.id
+            ).filter(
+                Stock.id == stock_id
+            ).order_by(desc(Fundamental.data_date)).first()
+            
+            if not row:
+                self.logger.error(f"Stock {stock_id} not found")
+                return None
+            
+            stock, stock_fundamental = row
+            if latest_fundamental is None:
+                latest_fundamental = stock_fundamental
+        elif latest_fundamental is None:
+            # Get latest fundamental data
+            latest_fundamental = db.query(Fundamental).filter(
+                Fundamental.stock_id == stock_id
+            ).order_by(desc(Fundamental.data_date)).first()
         
         if not latest_fundamental:
             self.logger.warning(f"No fundamental data for {stock.symbol}")
             return None
         
         # Compute fundamental score
-        fundamental_result = self.fundamental_scorer.compute_fundamental_score(latest_fundamental)
+        if fundamental_result is None:
+            fundamental_result = self.fundamental_scorer.compute_fundamental_score(latest_fundamental)
         fundamental_score = fundamental_result["total_score"]
         
         # Get aggregated sentiment score
-        sentiment_result = self.sentiment_analyzer.aggregate_sentiment_score(
-            stock_id=stock_id,
-            db=db,
-            days=30
-        )
+        if sentiment_result is None:
+            sentiment_result = self.sentiment_analyzer.aggregate_sentiment_score(
+                stock_id=stock_id,
+                db=db,
+                days=SENTIMENT_WINDOW_DAYS
+            )
         sentiment_score = sentiment_result["score_0_100"]
         
         # Compute weighted composite score
@@ -120,6 +149,19 @@ class CompositeScorer:
             "score_date": score_date
         }
     
+    def _load_sentiment_results(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Aggregate recent sentiment for every stock on a session of its own.
+        
+        Returns:
+            Aggregated sentiment data by stock ID
+        """
+        with get_db_context() as db:
+            return self.sentiment_analyzer.aggregate_sentiment_scores(
+                db=db,
+                days=SENTIMENT_WINDOW_DAYS
+            )
+    
     def score_all_stocks(self, db: Session) -> Dict[str, Any]:
         """
         Compute composite scores for all active stocks and update rankings.
@@ -135,26 +177,67 @@ class CompositeScorer:
         results = {
             "scored": 0,
             "skipped": 0,
-            "errors": 0,
-            "scores": []
+            "errors": 0
         }
         
-        # Get all active stocks
-        stocks = db.query(Stock).filter(Stock.is_active == True).all()
+        self.logger.info("Computing composite scores for active stocks")
         
-        self.logger.info(f"Computing composite scores for {len(stocks)} stocks")
+        # Preload every stock's inputs up front: latest fundamental per stock
+        # (DISTINCT ON) and sentiment grouped by stock, instead of two queries per
+        # stock. The two are independent, so sentiment is aggregated on a second
+        # connection while this one loads fundamentals.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            sentiment_future = executor.submit(self._load_sentiment_results)
+            
+            latest_fundamentals = {
+                fundamental.stock_id: fundamental
+                for fundamental in db.query(Fundamental).distinct(
+                    Fundamental.stock_id
+                ).order_by(
+                    Fundamental.stock_id,
+                    desc(Fundamental.data_date)
+                )
+            }
+            sentiment_results = sentiment_future.result()
+        no_sentiment = summarize_sentiment(None, SENTIMENT_WINDOW_DAYS)
         
-        # Compute scores
+        # Score every stock's fundamentals in one vectorized pass
+        fundamental_results = dict(zip(
+            latest_fundamentals,
+            self.fundamental_scorer.compute_fundamental_scores(list(latest_fundamentals.values()))
+        ))
+        
+        # Compute scores, streaming active stocks and keeping only the rows to
+        # insert (not the full results) so memory stays flat as the universe grows
+        rows = []
+        stocks = db.query(Stock).filter(Stock.is_active == True).yield_per(500)
         for stock in stocks:
+            latest_fundamental = latest_fundamentals.get(stock.id)
+            if latest_fundamental is None:
+                self.logger.warning(f"No fundamental data for {stock.symbol}")
+                results["skipped"] += 1
+                continue
+            
             try:
                 score_data = self.compute_composite_score(
                     stock_id=stock.id,
                     db=db,
-                    score_date=score_date
+                    score_date=score_date,
+                    stock=stock,
+                    latest_fundamental=latest_fundamental,
+                    sentiment_result=sentiment_results.get(stock.id, no_sentiment),
+                    fundamental_result=fundamental_results[stock.id]
                 )
                 
                 if score_data:
-                    results["scores"].append(score_data)
+                    rows.append({
+                        "stock_id": score_data["stock_id"],
+                        "fundamental_score": score_data["fundamental_score"],
+                        "sentiment_score": score_data["sentiment_score"],
+                        "composite_score": score_data["composite_score"],
+                        "score_breakdown": score_data["score_breakdown"],
+                        "score_date": score_date
+                    })
                     results["scored"] += 1
                 else:
                     results["skipped"] += 1
@@ -163,32 +246,27 @@ class CompositeScorer:
                 self.logger.error(f"Error scoring {stock.symbol}: {e}")
                 results["errors"] += 1
         
-        # Sort by composite score
-        results["scores"].sort(key=lambda x: x["composite_score"], reverse=True)
-        
-        # Assign ranks
-        for rank, score_data in enumerate(results["scores"], start=1):
-            score_data["rank"] = rank
-        
         # Store in database
         self.logger.info("Storing composite scores in database...")
         
-        for score_data in results["scores"]:
-            try:
-                composite_score = CompositeScore(
-                    stock_id=score_data["stock_id"],
-                    fundamental_score=score_data["fundamental_score"],
-                    sentiment_score=score_data["sentiment_score"],
-                    composite_score=score_data["composite_score"],
-                    rank=score_data["rank"],
-                    score_breakdown=score_data["score_breakdown"],
-                    score_date=score_date
-                )
-                
-                db.add(composite_score)
+        # One multi-row INSERT in a single transaction, bypassing ORM unit-of-work
+        # bookkeeping for rows that are never read back here
+        if rows:
+            db.execute(insert(CompositeScore), rows)
             
-            except Exception as e:
-                self.logger.error(f"Failed to store score for stock {score_data['stock_id']}: {e}")
+            # Rank this run in SQL rather than sorting the rows in Python
+            ranked = select(
+                CompositeScore.id,
+                func.row_number().over(
+                    order_by=(desc(CompositeScore.composite_score), CompositeScore.stock_id)
+                ).label("rank")
+            ).where(CompositeScore.score_date == score_date).subquery()
+            
+            db.execute(
+                update(CompositeScore).where(
+                    CompositeScore.id == ranked.c.id
+                ).values(rank=ranked.c.rank).execution_options(synchronize_session=False)
+            )
         
         db.commit()
         
@@ -216,7 +294,10 @@ class CompositeScorer:
         Returns:
             List of top stock scores
         """
-        query = db.query(CompositeScore).join(Stock).filter(
+        # Stock columns come back with each score, so no per-row lookup is needed
+        query = db.query(CompositeScore, Stock).join(
+            Stock, CompositeScore.stock_id == Stock.id
+        ).filter(
             Stock.is_active == True
         ).order_by(
             desc(CompositeScore.score_date),
@@ -226,11 +307,10 @@ class CompositeScorer:
         if min_composite_score is not None:
             query = query.filter(CompositeScore.composite_score >= min_composite_score)
         
-        scores = query.limit(limit).all()
+        rows = query.limit(limit).all()
         
         results = []
-        for score in scores:
-            stock = db.query(Stock).get(score.stock_id)
+        for score, stock in rows:
             results.append({
                 "rank": score.rank,
                 "symbol": stock.symbol,
@@ -2,8 +2,9 @@
 Fundamental scoring engine with config-driven rules.
 Computes fundamental score based on financial metrics.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime
+import numpy as np
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
@@ -14,6 +15,45 @@ from ..models.database import Stock, Fundamental, CompositeScore
 logger = get_logger(__name__)
 
 
+def score_metric_vec(
+    values: np.ndarray,
+    excellent: np.ndarray,
+    good: np.ndarray,
+    inverse: np.ndarray
+) -> np.ndarray:
+    """
+    Branchless, array form of FundamentalScorer.score_metric.
+    
+    Thresholds broadcast against values, so one call scores a whole
+    (stocks, metrics) array.
+    
+    Args:
+        values: Metric values, NaN for missing data
+        excellent: Threshold for excellent score (100pts)
+        good: Threshold for good score (70pts)
+        inverse: True where lower values are better
+        
+    Returns:
+        Scores from 0-100
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # For most metrics, higher is better
+        higher = np.select(
+            [values >= excellent, values >= good],
+            [100.0, 70 + 30 * (values - good) / (excellent - good)],
+            default=np.maximum(0, 70 * (values / good))
+        )
+        # For debt ratios, lower is better
+        lower = np.select(
+            [values <= excellent, values <= good],
+            [100.0, 70 + 30 * (1 - (values - excellent) / (good - excellent))],
+            default=np.maximum(0, 70 - (values - good) * 20)
+        )
+    
+    scores = np.where(inverse, lower, higher)
+    return np.where(np.isnan(values), 50.0, scores)  # Neutral score for missing data
+
+
 class FundamentalScorer:
     """
     Score stocks based on fundamental metrics.
@@ -64,6 +104,22 @@ class FundamentalScorer:
                 "weight": 0.15
             }
         }
+        
+        # Thresholds flattened once into (name, excellent, good, weight, inverse)
+        # tuples, and from those into arrays (one column per metric) for
+        # vectorized scoring
+        self._metric_specs = [
+            (name, t["excellent"], t["good"], t["weight"], t.get("inverse", False))
+            for name, t in self.thresholds.items()
+        ]
+        names, excellent, good, weights, inverse = zip(*self._metric_specs)
+        self._metric_names = names
+        self._metric_weights = weights
+        self._excellent = np.array(excellent, dtype=float)
+        self._good = np.array(good, dtype=float)
+        self._weight = np.array(weights, dtype=float)
+        self._inverse = np.array(inverse)
+        self._total_weight = sum(weights)
     
     def score_metric(
         self,
@@ -109,6 +165,18 @@ class FundamentalScorer:
                 # Decaying score below good threshold
                 return max(0, 70 * (value / good_threshold))
     
+    def score_metrics(self, values: np.ndarray) -> np.ndarray:
+        """
+        Score many metric values at once; vectorized form of score_metric.
+        
+        Args:
+            values: (N, metrics) array in threshold order, NaN for missing data
+            
+        Returns:
+            (N, metrics) array of scores from 0-100
+        """
+        return score_metric_vec(values, self._excellent, self._good, self._inverse)
+    
     def compute_fundamental_score(self, fundamental: Fundamental) -> Dict[str, Any]:
         """
         Compute fundamental score with breakdown.
@@ -119,57 +187,62 @@ class FundamentalScorer:
         Returns:
             Dictionary with total score and detailed breakdown
         """
-        scores = {}
-        total_score = 0
-        total_weight = 0
-        
-        # Score each metric
-        metric_mappings = {
-            "pe_ratio": fundamental.pe_ratio,
-            "pb_ratio": fundamental.pb_ratio,
-            "roe": fundamental.roe,
-            "debt_to_equity": fundamental.debt_to_equity,
-            "current_ratio": fundamental.current_ratio,
-            "operating_margin": fundamental.operating_margin,
-            "revenue_growth": fundamental.revenue_growth
-        }
+        return self.compute_fundamental_scores([fundamental])[0]
+    
+    def compute_fundamental_scores(
+        self,
+        fundamentals: Sequence[Fundamental]
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute fundamental scores for many records in one vectorized pass.
         
-        for metric_name, metric_value in metric_mappings.items():
-            if metric_name in self.thresholds:
-                threshold = self.thresholds[metric_name]
-                
-                score = self.score_metric(
-                    value=metric_value,
-                    excellent_threshold=threshold["excellent"],
-                    good_threshold=threshold["good"],
-                    inverse=threshold.get("inverse", False)
-                )
-                
-                weight = threshold["weight"]
-                weighted_score = score * weight
-                
-                scores[metric_name] = {
-                    "value": metric_value,
+        Args:
+            fundamentals: Fundamental data records
+            
+        Returns:
+            One result per record, as returned by compute_fundamental_score
+        """
+        if not fundamentals:
+            return []
+        
+        names = self._metric_names
+        weights = self._metric_weights
+        
+        # Stack metrics into an (N, metrics) array; None becomes NaN
+        raw_values = [[getattr(fundamental, name) for name in names] for fundamental in fundamentals]
+        scores = self.score_metrics(np.array(raw_values, dtype=float))
+        weighted_scores = scores * self._weight
+        
+        # Normalize if total weight != 1
+        total_weight = self._total_weight
+        if total_weight > 0:
+            final_scores = weighted_scores.sum(axis=1) / total_weight
+        else:
+            final_scores = np.full(len(fundamentals), 50.0)  # Neutral score if no metrics available
+        
+        results = []
+        for values, row_scores, row_weighted, final_score in zip(
+            raw_values, scores.tolist(), weighted_scores.tolist(), final_scores.tolist()
+        ):
+            breakdown = {
+                name: {
+                    "value": value,
                     "score": round(score, 2),
                     "weight": weight,
                     "weighted_score": round(weighted_score, 2)
                 }
-                
-                total_score += weighted_score
-                total_weight += weight
-        
-        # Normalize if total weight != 1 (due to missing metrics)
-        if total_weight > 0:
-            final_score = total_score / total_weight
-        else:
-            final_score = 50  # Neutral score if no metrics available
+                for name, value, score, weight, weighted_score in zip(
+                    names, values, row_scores, weights, row_weighted
+                )
+            }
+            results.append({
+                "total_score": round(final_score, 2),
+                "breakdown": breakdown,
+                "metrics_used": len(breakdown),
+                "total_weight": round(total_weight, 2)
+            })
         
-        return {
-            "total_score": round(final_score, 2),
-            "breakdown": scores,
-            "metrics_used": len(scores),
-            "total_weight": round(total_weight, 2)
-        }
+        return results
     
     def score_all_stocks(self, db: Session) -> Dict[str, Any]:
         """
@@ -1,11 +1,30 @@
 """
 Celery application configuration.
 """
+import orjson
 from celery import Celery
 from celery.schedules import crontab
+from kombu.serialization import register
 
 from ..core.config import settings
 
+
+def _orjson_dumps(obj) -> str:
+    """Serialize task messages and results with orjson."""
+    return orjson.dumps(
+        obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+# orjson codec for task payloads (score breakdowns are large nested dicts)
+register(
+    "orjson",
+    _orjson_dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="utf-8"
+)
+
 # Create Celery app
 celery_app = Celery(
     "stock_screener",
@@ -16,14 +35,21 @@ celery_app = Celery(
 
 # Configuration
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="orjson",
+    accept_content=["orjson", "json"],  # json: messages queued before the switch
+    result_serializer="orjson",
     timezone="Asia/Kolkata",  # Indian time zone
     enable_utc=True,
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    # Scheduled tasks ignore their results; the ones still stored (ad-hoc
+    # per-stock tasks) are compressed and kept for an hour
+    result_compression="gzip",
+    result_expires=60 * 60,
+    # Tasks are long-running; reserve one at a time so an idle worker can
+    # pick up the next one instead of it waiting behind a busy worker
+    worker_prefetch_multiplier=1,
 )
 
 # Scheduled tasks (Celery Beat)
@@ -50,6 +76,13 @@ celery_app.conf.beat_schedule = {
             hour="*/2"  # Every 2 hours, offset by 30 mins from news ingestion
         ),
     },
+    "purge-old-news": {
+        "task": "src.tasks.ingestion_tasks.purge_old_news",
+        "schedule": crontab(
+            hour=3,  # 3 AM IST, outside ingestion windows
+            minute=15
+        ),
+    },
     "compute-scores": {
         "task": "src.tasks.scoring_tasks.compute_all_scores",
         "schedule": crontab(
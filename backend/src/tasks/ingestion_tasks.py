@@ -1,31 +1,50 @@
 """
 Celery tasks for data ingestion.
 """
-from celery import shared_task
+from datetime import datetime, timedelta, timezone
+from typing import List
 
+from celery import group, shared_task
+from sqlalchemy import delete, select
+
+from ..core.config import settings
 from ..core.database import get_db_context
 from ..core.logging import get_logger
 from ..ingestion.fundamental_ingestor import FundamentalIngestor
 from ..ingestion.news_ingestor import NewsIngestor
-from ..sentiment.analyzer import SentimentAnalyzer
+from ..models.database import News
+from ..sentiment.analyzer import get_sentiment_analyzer
 
 logger = get_logger(__name__)
 
+# Rows deleted per transaction when purging old news
+NEWS_PURGE_BATCH_SIZE = 5000
+
+# Symbols per fundamental ingestion subtask. Large enough to keep yfinance's
+# batched session and the bulk upsert, small enough to spread across workers
+FUNDAMENTAL_BATCH_SIZE = 25
 
-@shared_task(bind=True, max_retries=3)
+
+@shared_task(bind=True, max_retries=3, ignore_result=True)
 def ingest_fundamental_data(self):
     """
     Celery task to ingest fundamental stock data.
     
-    Runs daily after market close.
+    Runs daily after market close. Splits the tracked universe into batches
+    and fans them out as a group so the worker pool ingests them in parallel.
     """
     logger.info("Starting fundamental data ingestion task")
     
     try:
-        ingestor = FundamentalIngestor(source="yfinance")
-        result = ingestor.run()
+        symbols = settings.tracked_stocks
+        batches = [
+            symbols[i:i + FUNDAMENTAL_BATCH_SIZE]
+            for i in range(0, len(symbols), FUNDAMENTAL_BATCH_SIZE)
+        ]
+        group(ingest_fundamental_batch.s(batch) for batch in batches).apply_async()
         
-        logger.info(f"Fundamental ingestion completed: {result}")
+        result = {"status": "dispatched", "batches": len(batches), "symbols": len(symbols)}
+        logger.info(f"Fundamental ingestion dispatched: {result}")
         return result
     
     except Exception as e:
@@ -34,7 +53,29 @@ def ingest_fundamental_data(self):
         raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
 
 
-@shared_task(bind=True, max_retries=3)
+@shared_task(bind=True, max_retries=3, acks_late=True, ignore_result=True)
+def ingest_fundamental_batch(self, symbols: List[str]):
+    """
+    Ingest fundamental data for a batch of stock symbols.
+    
+    Args:
+        symbols: Stock symbols
+        
+    Returns:
+        Ingestion result
+    """
+    logger.info(f"Ingesting fundamental data for {len(symbols)} symbols")
+    
+    try:
+        ingestor = FundamentalIngestor(source="yfinance", symbols=symbols)
+        return ingestor.run()
+    
+    except Exception as e:
+        logger.error(f"Fundamental ingestion failed for batch {symbols[0]}..{symbols[-1]}: {e}")
+        raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
+
+
+@shared_task(bind=True, max_retries=3, acks_late=True, ignore_result=True)
 def ingest_news_data(self):
     """
     Celery task to ingest news articles.
@@ -60,7 +101,7 @@ def ingest_news_data(self):
         raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
 
 
-@shared_task(bind=True, max_retries=2)
+@shared_task(bind=True, max_retries=2, acks_late=True, ignore_result=True)
 def analyze_pending_sentiment(self):
     """
     Celery task to analyze sentiment for news without sentiment scores.
@@ -70,7 +111,7 @@ def analyze_pending_sentiment(self):
     logger.info("Starting sentiment analysis task")
     
     try:
-        analyzer = SentimentAnalyzer()
+        analyzer = get_sentiment_analyzer()
         
         with get_db_context() as db:
             result = analyzer.analyze_pending_news(db=db, limit=100)
@@ -97,19 +138,44 @@ def ingest_fundamental_for_symbol(symbol: str):
     logger.info(f"Ingesting fundamental data for {symbol}")
     
     try:
-        from ..core.config import settings
-        # Temporarily override tracked stocks
-        original_stocks = settings.TRACKED_STOCKS
-        settings.TRACKED_STOCKS = [symbol]
-        
-        ingestor = FundamentalIngestor(source="yfinance")
+        ingestor = FundamentalIngestor(source="yfinance", symbols=[symbol])
         result = ingestor.run()
         
-        # Restore original stocks
-        settings.TRACKED_STOCKS = original_stocks
-        
         return result
     
     except Exception as e:
         logger.error(f"Failed to ingest fundamental data for {symbol}: {e}")
         raise
+
+
+@shared_task(ignore_result=True)
+def purge_old_news():
+    """
+    Delete news (and, by cascade, its stock links and sentiment scores)
+    older than NEWS_RETENTION_DAYS.
+    
+    Keeps the news tables and their indexes bounded. Deletes run in small
+    batches, each in its own transaction, so locks are held briefly.
+    
+    Returns:
+        Purge result
+    """
+    retention_days = settings.NEWS_RETENTION_DAYS
+    if retention_days <= 0:
+        return {"status": "disabled", "deleted": 0}
+    
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
+    logger.info(f"Purging news published before {cutoff.isoformat()}")
+    
+    deleted = 0
+    while True:
+        with get_db_context() as db:
+            batch_ids = select(News.id).where(News.published_at < cutoff).limit(NEWS_PURGE_BATCH_SIZE)
+            result = db.execute(delete(News).where(News.id.in_(batch_ids.scalar_subquery())))
+        
+        deleted += result.rowcount
+        if result.rowcount < NEWS_PURGE_BATCH_SIZE:
+            break
+    
+    logger.info(f"Purged {deleted} news articles")
+    return {"status": "success", "deleted": deleted}
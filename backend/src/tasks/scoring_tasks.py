@@ -3,14 +3,15 @@ Celery tasks for scoring computation.
 """
 from celery import shared_task
 
-from ..core.database import get_db_context
+from ..core.cache import RANKINGS_NAMESPACE, clear_cache_namespace
+from ..core.database import get_db_context, refresh_latest_scores_view
 from ..core.logging import get_logger
 from ..scoring.composite_scorer import CompositeScorer
 
 logger = get_logger(__name__)
 
 
-@shared_task(bind=True, max_retries=2)
+@shared_task(bind=True, max_retries=2, ignore_result=True)
 def compute_all_scores(self):
     """
     Celery task to compute composite scores for all stocks.
@@ -24,22 +25,33 @@ def compute_all_scores(self):
         
         with get_db_context() as db:
             result = scorer.score_all_stocks(db=db)
-        
-        logger.info(
-            f"Score computation completed: {result['scored']} scored, "
-            f"{result['skipped']} skipped, {result['errors']} errors"
-        )
-        
-        return {
-            "status": "success",
-            "scored": result["scored"],
-            "skipped": result["skipped"],
-            "errors": result["errors"]
-        }
     
     except Exception as e:
         logger.error(f"Score computation failed: {e}")
         raise self.retry(exc=e, countdown=120 * (2 ** self.request.retries))
+    
+    # Scores are committed at this point; a failed refresh must not trigger a
+    # retry, which would rescore and store a duplicate snapshot
+    try:
+        with get_db_context() as db:
+            refresh_latest_scores_view(db)
+    except Exception as e:
+        logger.error(f"Failed to refresh latest scores view: {e}")
+    
+    # New scores invalidate cached rankings
+    clear_cache_namespace(RANKINGS_NAMESPACE)
+    
+    logger.info(
+        f"Score computation completed: {result['scored']} scored, "
+        f"{result['skipped']} skipped, {result['errors']} errors"
+    )
+    
+    return {
+        "status": "success",
+        "scored": result["scored"],
+        "skipped": result["skipped"],
+        "errors": result["errors"]
+    }
 
 
 @shared_task
@@ -1,9 +1,7 @@
+import asyncio
 import sys
-import time
-import urllib.request
-import urllib.error
-import urllib.parse
-import json
+
+import httpx
 
 BASE_URL = "http://localhost:8000"
 
@@ -13,43 +11,67 @@ def green(text):
 def red(text):
     return f"\033[91m{text}\033[0m"
 
-def check_endpoint(name, url):
-    print(f"Checking {name} ({url})...", end=" ")
+async def check_endpoint(client, name, url):
+    # Returns (name, url, ok, data, error); printing is left to the caller so
+    # checks can run concurrently and still report in a fixed order
     try:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req) as response:
-            status = response.status
-            data = json.loads(response.read().decode())
-            
-            if status == 200:
-                print(green("OK"))
-                return True, data
-            else:
-                print(red(f"FAILED (Status: {status})"))
-                return False, data
-    except urllib.error.URLError as e:
-        print(red(f"FAILED (Error: {e})"))
-        return False, None
+        response = await client.get(url)
+    except httpx.HTTPError as e:
+        return name, url, False, None, f"Error: {e}"
     except Exception as e:
-        print(red(f"FAILED (Exception: {e})"))
-        return False, None
+        return name, url, False, None, f"Exception: {e}"
+    
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    
+    if response.status_code == 200:
+        return name, url, True, data, None
+    return name, url, False, data, f"Status: {response.status_code}"
+
+def report(result):
+    name, url, ok, data, error = result
+    print(f"Checking {name} ({url})...", end=" ")
+    if ok:
+        print(green("OK"))
+    else:
+        print(red(f"FAILED ({error})"))
+    return ok, data
+
+async def run_checks(checks):
+    # One pooled client, so every check reuses the same keep-alive connections
+    async with httpx.AsyncClient(timeout=5, follow_redirects=True) as client:
+        return await asyncio.gather(
+            *(check_endpoint(client, name, url) for name, url in checks)
+        )
 
 def main():
     print(f"Starting Backend Service Verification against {BASE_URL}\n")
     
+    # Fire every check at once; total time is the slowest endpoint, not the sum
+    root, health, stocks_api, docs, stocks_list, stocks_list_no_slash = asyncio.run(run_checks([
+        ("Root", f"{BASE_URL}/"),
+        ("Health", f"{BASE_URL}/health"),
+        ("Stocks API", f"{BASE_URL}/api/v1/stocks"),
+        ("API Documentation", f"{BASE_URL}/docs"),
+        ("Stocks List", f"{BASE_URL}/api/v1/stocks/"),
+        ("Stocks List (no slash)", f"{BASE_URL}/api/v1/stocks"),
+    ]))
+    
     # 1. Check Root
-    ok, data = check_endpoint("Root", f"{BASE_URL}/")
+    ok, data = report(root)
     if ok:
         print(f"  App Name: {data.get('name')}")
         print(f"  Status: {data.get('status')}")
     else:
         print("  Could not connect to backend. Is it running?")
         sys.exit(1)
-
+    
     print("-" * 30)
-
+    
     # 2. Check Health (DB & Redis)
-    ok, data = check_endpoint("Health", f"{BASE_URL}/health")
+    ok, data = report(health)
     if ok:
         db_status = data.get("database")
         redis_status = data.get("redis")
@@ -58,35 +80,29 @@ def main():
             print(f"  Database: {green(db_status)}")
         else:
             print(f"  Database: {red(db_status)}")
-            
+        
         if redis_status == "healthy":
             print(f"  Redis: {green(redis_status)}")
         else:
             print(f"  Redis: {red(redis_status)}")
-            
+        
         if db_status != "healthy" or redis_status != "healthy":
             print(red("\nOne or more services are unhealthy!"))
             # Don't exit yet, check other endpoints
-            
+    
     print("-" * 30)
-
+    
     # 3. Check API Routes
-    endpoints = [
-        ("/api/v1/stocks", "Stocks API"), # This might need a trailing slash or specific endpoint
-        ("/docs", "API Documentation"),
-    ]
+    report(stocks_api)
+    report(docs)
     
-    for path, name in endpoints:
-        check_endpoint(name, f"{BASE_URL}{path}")
-
-    # 4. Check specific logical endpoints (using a safe method if possible, or just checking 404 vs 401/200)
-    # We'll check /api/v1/stocks/ (list) usually
+    # 4. Check specific logical endpoints
     print("-" * 30)
     print("Checking Stocks Listing...")
-    ok, _ = check_endpoint("Stocks List", f"{BASE_URL}/api/v1/stocks/") 
+    ok, _ = report(stocks_list)
     if not ok:
-         # Try without trailing slash if redirects aren't handled auto by urllib
-         check_endpoint("Stocks List (no slash)", f"{BASE_URL}/api/v1/stocks")
+        # Fall back to the path without the trailing slash
+        report(stocks_list_no_slash)
 
 if __name__ == "__main__":
     main()
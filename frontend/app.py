@@ -47,6 +47,10 @@ st.markdown("""
 st.title(f"{APP_ICON} {APP_TITLE}")
 st.markdown("---")
 
+# Login confirmation handed over from the login page
+if st.session_state.pop("just_logged_in", False):
+    st.toast("Login successful!", icon="✅")
+
 # Sidebar Auth Status
 with st.sidebar:
     if "token" in st.session_state and st.session_state["token"]:
@@ -3,7 +3,6 @@ Login & Signup Page.
 """
 import streamlit as st
 from utils.api_client import get_api_client
-import time
 
 st.set_page_config(page_title="Login - Personal Stock Screener", page_icon="🔑", layout="centered")
 
@@ -35,8 +34,9 @@ with tab1:
                         user = client.get_me()
                         st.session_state["user"] = user
                         
-                        st.success("Login successful!")
-                        time.sleep(1)
+                        # Confirmed with a toast on the landing page, so the
+                        # switch happens immediately instead of after a pause
+                        st.session_state["just_logged_in"] = True
                         st.switch_page("app.py")
                     else:
                         st.error("Invalid credentials")
@@ -1,8 +1,11 @@
 """
 Home Page - Dashboard with overview and top performers.
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from utils.api_client import get_api_client
 from utils.config import get_score_color
 
@@ -37,7 +40,9 @@ with col2:
 with col3:
     # Calculate average composite score
     if stocks:
-        avg_score = sum(s.get('composite_score', 0) for s in stocks) / len(stocks)
+        # Stocks without a score count as 0
+        scores = pd.DataFrame(stocks, columns=["composite_score"])["composite_score"]
+        avg_score = scores.fillna(0).mean()
         st.metric(
             label="Avg Composite Score",
             value=f"{avg_score:.1f}",
@@ -58,17 +63,25 @@ st.markdown("---")
 # Top Performers Section
 st.header("🏆 Top Performers")
 
+# Fetch all three rankings concurrently instead of one per tab. Worker threads
+# get this run's script context so the client can read the session token.
+with st.spinner("Loading top stocks..."):
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        rankings = {
+            ranking_type: executor.submit(client.get_rankings, ranking_type, limit=10)
+            for ranking_type in ("composite", "fundamental", "sentiment")
+        }
+    top_composite = rankings["composite"].result()
+    top_fundamental = rankings["fundamental"].result()
+    top_sentiment = rankings["sentiment"].result()
+
 tab1, tab2, tab3 = st.tabs(["📊 Composite Score", "📈 Fundamentals", "💬 Sentiment"])
 
 with tab1:
     st.subheader("Top 10 by Composite Score")
-    with st.spinner("Loading top stocks..."):
-        top_composite = client.get_rankings("composite", limit=10)
     
     if top_composite:
-        # Create DataFrame
-        df = pd.DataFrame(top_composite)
-        
         # Display as cards
         for idx, stock in enumerate(top_composite, 1):
             col1, col2, col3, col4, col5 = st.columns([1, 3, 2, 2, 2])
@@ -98,8 +111,6 @@ with tab1:
 
 with tab2:
     st.subheader("Top 10 by Fundamental Score")
-    with st.spinner("Loading..."):
-        top_fundamental = client.get_rankings("fundamental", limit=10)
     
     if top_fundamental:
         for idx, stock in enumerate(top_fundamental, 1):
@@ -122,8 +133,6 @@ with tab2:
 
 with tab3:
     st.subheader("Top 10 by Sentiment Score")
-    with st.spinner("Loading..."):
-        top_sentiment = client.get_rankings("sentiment", limit=10)
     
     if top_sentiment:
         for idx, stock in enumerate(top_sentiment, 1):
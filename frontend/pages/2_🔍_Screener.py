@@ -15,6 +15,12 @@ st.markdown("---")
 # Initialize API client
 client = get_api_client()
 
+# Columns shown in the results table, in display order
+RESULT_COLUMNS = [
+    "symbol", "name", "composite_score", "fundamental_score",
+    "sentiment_score", "pe_ratio", "roe",
+]
+
 # Sidebar filters
 with st.sidebar:
     st.header("Screening Filters")
@@ -85,37 +91,24 @@ if screen_button:
         # Convert to DataFrame for better display
         df = pd.DataFrame(results)
         
-        # Display results in a nice format
-        for idx, stock in enumerate(results):
-            col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
-            
-            with col1:
-                st.markdown(f"### **{stock.get('symbol', 'N/A')}**")
-                st.caption(stock.get('name', 'N/A'))
-            
-            with col2:
-                composite = stock.get('composite_score', 0)
-                st.metric(
-                    "Composite Score",
-                    f"{composite:.1f}",
-                    delta=None,
-                    delta_color="off"
-                )
-            
-            with col3:
-                pe = stock.get('pe_ratio', 0)
-                roe = stock.get('roe', 0)
-                st.metric("PE Ratio", f"{pe:.2f}")
-                st.metric("ROE", f"{roe:.1f}%")
-            
-            with col4:
-                fundamental = stock.get('fundamental_score', 0)
-                sentiment = stock.get('sentiment_score', 0)
-                st.metric("Fundamental", f"{fundamental:.1f}")
-                st.metric("Sentiment", f"{sentiment:.1f}")
-            
-            if idx < len(results) - 1:
-                st.divider()
+        # One table instead of a row of widgets per stock; the browser renders
+        # and scrolls it client-side
+        st.dataframe(
+            df.reindex(columns=RESULT_COLUMNS),
+            column_config={
+                "symbol": "Symbol",
+                "name": "Name",
+                "composite_score": st.column_config.ProgressColumn(
+                    "Composite Score", format="%.1f", min_value=0, max_value=100
+                ),
+                "fundamental_score": st.column_config.NumberColumn("Fundamental", format="%.1f"),
+                "sentiment_score": st.column_config.NumberColumn("Sentiment", format="%.1f"),
+                "pe_ratio": st.column_config.NumberColumn("PE Ratio", format="%.2f"),
+                "roe": st.column_config.NumberColumn("ROE", format="%.1f%%"),
+            },
+            use_container_width=True,
+            hide_index=True,
+        )
         
         # Download button for CSV
         csv = df.to_csv(index=False)
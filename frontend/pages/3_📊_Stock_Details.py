@@ -1,8 +1,11 @@
 """
 Stock Details Page - Deep dive into individual stock analysis.
 """
+import html
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import plotly.graph_objects as go
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from utils.api_client import get_api_client
 from utils.config import get_score_color
 
@@ -15,10 +18,44 @@ st.markdown("---")
 # Initialize API client
 client = get_api_client()
 
+# Gauges are read-only: render them static, without the mode bar
+GAUGE_CONFIG = {"staticPlot": True, "displayModeBar": False}
+
+# Parts shared by every gauge (Streamlit copies figures, so sharing is safe)
+GAUGE_AXIS = {"range": [None, 100]}
+GAUGE_STEPS = [
+    {"range": [0, 40], "color": "#1a1a2e"},
+    {"range": [40, 60], "color": "#16213e"},
+    {"range": [60, 80], "color": "#0f3460"},
+    {"range": [80, 100], "color": "#0a1929"},
+]
+GAUGE_LAYOUT = {"height": 250, "margin": {"l": 20, "r": 20, "t": 40, "b": 20}}
+
+
+def gauge_chart(value: float, title: str) -> dict:
+    """Plotly gauge for a 0-100 score, as a plain figure dict."""
+    return {
+        "data": [{
+            "type": "indicator",
+            "mode": "gauge+number",
+            "value": value,
+            "domain": {"x": [0, 1], "y": [0, 1]},
+            "title": {"text": title},
+            "gauge": {
+                "axis": GAUGE_AXIS,
+                "bar": {"color": get_score_color(value)},
+                "steps": GAUGE_STEPS,
+            },
+        }],
+        "layout": GAUGE_LAYOUT,
+    }
+
+
 # Stock selector
 stocks = client.get_all_stocks(limit=500)
 if stocks:
-    stock_symbols = sorted([s.get('symbol') for s in stocks if s.get('symbol')])
+    # The API returns stocks ordered by symbol
+    stock_symbols = [s['symbol'] for s in stocks]
     selected_symbol = st.selectbox(
         "Select a stock",
         options=stock_symbols,
@@ -26,8 +63,15 @@ if stocks:
     )
     
     if selected_symbol:
+        # Fetch details and news sentiment concurrently; worker threads get
+        # this run's script context so the client can read the session token
         with st.spinner(f"Loading {selected_symbol} details..."):
-            stock_data = client.get_stock(selected_symbol)
+            ctx = get_script_run_ctx()
+            with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+                stock_future = executor.submit(client.get_stock, selected_symbol)
+                sentiment_future = executor.submit(client.get_stock_sentiment, selected_symbol)
+            stock_data = stock_future.result()
+            news_sentiments = sentiment_future.result()
         
         if stock_data:
             # Parse nested response
@@ -67,24 +111,7 @@ if stocks:
                 )
                 
                 # Gauge chart for fundamental
-                fig_fund = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=fundamental,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Fundamental"},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': get_score_color(fundamental)},
-                        'steps': [
-                            {'range': [0, 40], 'color': '#1a1a2e'},
-                            {'range': [40, 60], 'color': '#16213e'},
-                            {'range': [60, 80], 'color': '#0f3460'},
-                            {'range': [80, 100], 'color': '#0a1929'}
-                        ],
-                    }
-                ))
-                fig_fund.update_layout(height=250, margin=dict(l=20, r=20, t=40, b=20))
-                st.plotly_chart(fig_fund, use_container_width=True)
+                st.plotly_chart(gauge_chart(fundamental, "Fundamental"), use_container_width=True, config=GAUGE_CONFIG)
             
             with col2:
                 sentiment = latest_score.get('sentiment_score') or 0
@@ -95,24 +122,7 @@ if stocks:
                 )
                 
                 # Gauge chart for sentiment
-                fig_sent = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=sentiment,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Sentiment"},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': get_score_color(sentiment)},
-                        'steps': [
-                            {'range': [0, 40], 'color': '#1a1a2e'},
-                            {'range': [40, 60], 'color': '#16213e'},
-                            {'range': [60, 80], 'color': '#0f3460'},
-                            {'range': [80, 100], 'color': '#0a1929'}
-                        ],
-                    }
-                ))
-                fig_sent.update_layout(height=250, margin=dict(l=20, r=20, t=40, b=20))
-                st.plotly_chart(fig_sent, use_container_width=True)
+                st.plotly_chart(gauge_chart(sentiment, "Sentiment"), use_container_width=True, config=GAUGE_CONFIG)
             
             with col3:
                 st.metric(
@@ -122,47 +132,35 @@ if stocks:
                 )
                 
                 # Gauge chart for composite
-                fig_comp = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=composite_score,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Composite"},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': get_score_color(composite_score)},
-                        'steps': [
-                            {'range': [0, 40], 'color': '#1a1a2e'},
-                            {'range': [40, 60], 'color': '#16213e'},
-                            {'range': [60, 80], 'color': '#0f3460'},
-                            {'range': [80, 100], 'color': '#0a1929'}
-                        ],
-                    }
-                ))
-                fig_comp.update_layout(height=250, margin=dict(l=20, r=20, t=40, b=20))
-                st.plotly_chart(fig_comp, use_container_width=True)
+                st.plotly_chart(gauge_chart(composite_score, "Composite"), use_container_width=True, config=GAUGE_CONFIG)
             
             st.markdown("---")
             
             # Fundamental Metrics
             st.subheader("📊 Fundamental Metrics")
             
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("PE Ratio", f"{fundamentals.get('pe_ratio') or 0:.2f}")
-                st.metric("PB Ratio", f"{fundamentals.get('pb_ratio') or 0:.2f}")
-            
-            with col2:
-                st.metric("ROE", f"{fundamentals.get('roe') or 0:.1f}%")
-                st.metric("ROCE", f"{fundamentals.get('roce') or 0:.1f}%")
-            
-            with col3:
-                st.metric("Debt-to-Equity", f"{fundamentals.get('debt_to_equity') or 0:.2f}")
-                st.metric("Current Ratio", f"{fundamentals.get('current_ratio') or 0:.2f}")
-            
-            with col4:
-                st.metric("Revenue Growth", f"{fundamentals.get('revenue_growth') or 0:.1f}%")
-                st.metric("Earnings Growth", f"{fundamentals.get('earnings_growth') or 0:.1f}%")
+            # One grid element instead of eight st.metric widgets; row-major,
+            # so each column pairs related metrics as before
+            metrics = [
+                ("PE Ratio", f"{fundamentals.get('pe_ratio') or 0:.2f}"),
+                ("ROE", f"{fundamentals.get('roe') or 0:.1f}%"),
+                ("Debt-to-Equity", f"{fundamentals.get('debt_to_equity') or 0:.2f}"),
+                ("Revenue Growth", f"{fundamentals.get('revenue_growth') or 0:.1f}%"),
+                ("PB Ratio", f"{fundamentals.get('pb_ratio') or 0:.2f}"),
+                ("ROCE", f"{fundamentals.get('roce') or 0:.1f}%"),
+                ("Current Ratio", f"{fundamentals.get('current_ratio') or 0:.2f}"),
+                ("Earnings Growth", f"{fundamentals.get('earnings_growth') or 0:.1f}%"),
+            ]
+            st.markdown(
+                "<div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin-bottom: 1rem;'>"
+                + "".join(
+                    f"<div><div style='color: #888; font-size: 0.875rem;'>{label}</div>"
+                    f"<div style='font-size: 1.75rem;'>{value}</div></div>"
+                    for label, value in metrics
+                )
+                + "</div>",
+                unsafe_allow_html=True
+            )
             
             st.markdown("---")
             
@@ -191,10 +189,9 @@ if stocks:
             # Latest News & Sentiment
             st.subheader("📰 Latest News & Sentiment")
             
-            # Fetch recent sentiment data
-            news_sentiments = client.get_stock_sentiment(selected_symbol)
-            
             if news_sentiments:
+                # All cards go out as one markdown element rather than one per article
+                cards = []
                 for item in news_sentiments:
                     news = item.get('news', {})
                     if not news:
@@ -207,20 +204,18 @@ if stocks:
                     icon = "🟢" if s_score >= 0.2 else "🔴" if s_score <= -0.2 else "⚪"
                     color = get_score_color((s_score + 1) * 50)  # Map -1..1 to 0..100
                     
-                    with st.container():
-                        st.markdown(f"""
-                        <div style="padding: 1rem; background-color: #1E1E1E; border-radius: 0.5rem; margin-bottom: 0.5rem; border-left: 5px solid {color}">
-                            <div style="font-size: 1.1rem; font-weight: bold;">
-                                <a href="{news.get('url', '#')}" target="_blank" style="text-decoration: none; color: white;">
-                                    {icon} {news.get('title', 'No Title')}
-                                </a>
-                            </div>
-                            <div style="display: flex; justify-content: space-between; margin-top: 0.5rem; font-size: 0.8rem; color: #888;">
-                                <span>{news.get('source', 'Unknown Source')} • {news.get('published_at', '')[:10]}</span>
-                                <span>Sentiment: {s_label.upper()} ({s_score:.2f})</span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                    cards.append(
+                        f'<div style="padding: 1rem; background-color: #1E1E1E; border-radius: 0.5rem; margin-bottom: 0.5rem; border-left: 5px solid {color}">'
+                        f'<div style="font-size: 1.1rem; font-weight: bold;">'
+                        f'<a href="{html.escape(news.get("url") or "#")}" target="_blank" style="text-decoration: none; color: white;">'
+                        f'{icon} {html.escape(news.get("title") or "No Title")}</a></div>'
+                        f'<div style="display: flex; justify-content: space-between; margin-top: 0.5rem; font-size: 0.8rem; color: #888;">'
+                        f'<span>{html.escape(news.get("source") or "Unknown Source")} • {(news.get("published_at") or "")[:10]}</span>'
+                        f'<span>Sentiment: {s_label.upper()} ({s_score:.2f})</span></div>'
+                        f'</div>'
+                    )
+                
+                st.markdown("\n".join(cards), unsafe_allow_html=True)
             else:
                 st.info("No recent news articles found for this stock.")
             
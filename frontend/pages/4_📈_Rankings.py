@@ -1,6 +1,8 @@
 """
 Rankings Page - View top stocks by different metrics.
 """
+import html
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -16,6 +18,13 @@ st.markdown("---")
 # Initialize API client
 client = get_api_client()
 
+
+@st.cache_data(ttl=60, show_spinner=False)
+def rankings_csv(ranking_type: str, limit: int) -> bytes:
+    """CSV export of a ranking, cached so reruns skip the serialization."""
+    return pd.DataFrame(client.get_rankings(ranking_type, limit=limit)).to_csv(index=False).encode()
+
+
 # Sidebar controls
 with st.sidebar:
     st.header("Ranking Options")
@@ -58,61 +67,74 @@ if rankings:
     with tab1:
         st.subheader(f"Top {limit} by {ranking_type.capitalize()} Score")
         
+        # One HTML table instead of a row of columns and metrics per stock
+        score_key = f'{ranking_type}_score'
+        extra_columns = [
+            (key, label) for key, label in (
+                ('composite_score', 'Composite'),
+                ('fundamental_score', 'Fundamental'),
+                ('sentiment_score', 'Sentiment'),
+            )
+            if key != score_key
+        ]
+        rank_badges = {1: "🥇", 2: "🥈", 3: "🥉"}
+        
+        header = "".join(
+            f"<th style='text-align: left; padding: 0.5rem;'>{label}</th>"
+            for label in ["Rank", "Stock", f"{ranking_type.capitalize()} Score", "PE Ratio", "ROE"]
+            + [label for _, label in extra_columns]
+        )
+        rows = []
         for idx, stock in enumerate(rankings, 1):
-            col1, col2, col3, col4, col5 = st.columns([1, 3, 2, 2, 2])
-            
-            with col1:
-                # Rank badge
-                if idx == 1:
-                    st.markdown("### 🥇")
-                elif idx == 2:
-                    st.markdown("### 🥈")
-                elif idx == 3:
-                    st.markdown("### 🥉")
-                else:
-                    st.markdown(f"### #{idx}")
-            
-            with col2:
-                st.markdown(f"**{stock.get('symbol')}**")
-                st.caption(stock.get('name', 'N/A'))
-            
-            with col3:
-                score = stock.get(f'{ranking_type}_score', 0)
-                color = get_score_color(score)
-                st.markdown(f"<div style='font-size: 1.5rem; color: {color}; font-weight: bold;'>{score:.1f}</div>", unsafe_allow_html=True)
-                st.caption(f"{ranking_type.capitalize()} Score")
-            
-            with col4:
-                st.metric("PE Ratio", f"{stock.get('pe_ratio', 0):.2f}")
-                st.metric("ROE", f"{stock.get('roe', 0):.1f}%")
-            
-            with col5:
-                st.metric("Composite", f"{stock.get('composite_score', 0):.1f}")
-                if ranking_type != "fundamental":
-                    st.metric("Fundamental", f"{stock.get('fundamental_score', 0):.1f}")
-                if ranking_type != "sentiment":
-                    st.metric("Sentiment", f"{stock.get('sentiment_score', 0):.1f}")
-            
-            st.divider()
+            score = stock.get(score_key) or 0
+            cells = [
+                f"<td style='padding: 0.5rem; font-size: 1.3rem;'>{rank_badges.get(idx, f'#{idx}')}</td>",
+                f"<td style='padding: 0.5rem;'><b>{html.escape(stock.get('symbol') or '')}</b>"
+                f"<br><span style='color: #888; font-size: 0.85rem;'>{html.escape(stock.get('name') or 'N/A')}</span></td>",
+                f"<td style='padding: 0.5rem; font-size: 1.3rem; color: {get_score_color(score)}; font-weight: bold;'>{score:.1f}</td>",
+                f"<td style='padding: 0.5rem;'>{stock.get('pe_ratio') or 0:.2f}</td>",
+                f"<td style='padding: 0.5rem;'>{stock.get('roe') or 0:.1f}%</td>",
+            ]
+            cells += [
+                f"<td style='padding: 0.5rem;'>{stock.get(key) or 0:.1f}</td>"
+                for key, _ in extra_columns
+            ]
+            rows.append(f"<tr style='border-bottom: 1px solid #333;'>{''.join(cells)}</tr>")
+        
+        st.markdown(
+            f"<table style='width: 100%; border-collapse: collapse;'>"
+            f"<thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>",
+            unsafe_allow_html=True
+        )
     
     with tab2:
         st.subheader("Score Distribution")
         
-        # Bar chart of scores
-        fig = px.bar(
-            df.head(20),
-            x='symbol',
-            y=f'{ranking_type}_score',
-            color=f'{ranking_type}_score',
-            color_continuous_scale=['#ef4444', '#f59e0b', '#3b82f6', '#10b981'],
-            labels={f'{ranking_type}_score': f'{ranking_type.capitalize()} Score', 'symbol': 'Stock Symbol'},
-            title=f'Top 20 Stocks by {ranking_type.capitalize()} Score'
-        )
-        fig.update_layout(
-            height=500,
-            xaxis_tickangle=-45,
-            showlegend=False
-        )
+        # Bar chart of scores, as a plain figure dict; plotly express would
+        # rebuild the frame and resolve a template on every rerun
+        top_df = df.head(20)
+        score_col = f'{ranking_type}_score'
+        score_label = f'{ranking_type.capitalize()} Score'
+        fig = {
+            "data": [{
+                "type": "bar",
+                "x": top_df['symbol'].tolist(),
+                "y": top_df[score_col].tolist(),
+                "marker": {
+                    "color": top_df[score_col].tolist(),
+                    "colorscale": [[0, '#ef4444'], [1 / 3, '#f59e0b'], [2 / 3, '#3b82f6'], [1, '#10b981']],
+                    "colorbar": {"title": {"text": score_label}},
+                },
+                "hovertemplate": "%{x}<br>" + score_label + ": %{y:.1f}<extra></extra>",
+            }],
+            "layout": {
+                "title": {"text": f'Top 20 Stocks by {score_label}'},
+                "height": 500,
+                "xaxis": {"title": {"text": 'Stock Symbol'}, "tickangle": -45},
+                "yaxis": {"title": {"text": score_label}},
+                "showlegend": False,
+            },
+        }
         st.plotly_chart(fig, use_container_width=True)
         
         # Scatter plot: Composite vs Fundamental vs Sentiment
@@ -145,21 +167,22 @@ if rankings:
             'symbol', 'name', f'{ranking_type}_score',
             'pe_ratio', 'pb_ratio', 'roe', 'debt_to_equity',
             'composite_score', 'fundamental_score', 'sentiment_score'
-        ]].copy()
+        ]]
         
-        # Round numeric columns
+        # Show numeric columns to 2 decimals; formatted in the browser, so
+        # the frame is not copied and rounded on every rerun
         numeric_cols = display_df.select_dtypes(include=['float64']).columns
-        display_df[numeric_cols] = display_df[numeric_cols].round(2)
         
         # Display table
         st.dataframe(
             display_df,
+            column_config={col: st.column_config.NumberColumn(format="%.2f") for col in numeric_cols},
             use_container_width=True,
             height=600
         )
         
         # Download button
-        csv = df.to_csv(index=False)
+        csv = rankings_csv(ranking_type, limit)
         st.download_button(
             label=f"📥 Download {ranking_type.capitalize()} Rankings (CSV)",
             data=csv,
@@ -1,35 +1,120 @@
 """
 API Client for communicating with the backend.
 """
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import orjson
 import requests
 import streamlit as st
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Any, Tuple
 from utils.config import API_BASE_URL
 
 
+# Consecutive connection failures before requests are short-circuited, and
+# for how long; avoids stalling every rerun on a backend that is down
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_OPEN_SECONDS = 10.0
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Get the HTTP session shared by every page, rerun and user.
+    
+    Keeps pooled keep-alive connections to the backend instead of opening
+    new ones per client. Auth travels in per-request headers and cookies are
+    refused, so nothing user-specific is stored on the shared session.
+    """
+    session = requests.Session()
+    # Sized for concurrent sessions each fetching a few endpoints in parallel;
+    # idempotent requests retry briefly when the backend is restarting
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
 class APIClient:
     """Client for backend API interactions."""
     
     def __init__(self, base_url: str = API_BASE_URL):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.root_url = base_url.replace('/api/v1', '')
+        self.session = get_http_session()
+        # (url, params) -> (ETag, parsed body) of the last full response
+        self._etags: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[str, Any]] = {}
+        # Circuit breaker state, shared by all callers of this client
+        self._failures = 0
+        self._open_until = 0.0
     
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
-        """Handle API response and errors."""
+    def _request(self, method: str, url: str, **kwargs: Any) -> Optional[requests.Response]:
+        """Send a request, reporting transport failures instead of raising."""
+        if time.monotonic() < self._open_until:
+            st.error("Cannot connect to backend API. Is it running?")
+            return None
+        
         try:
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            st.error(f"API Error: {e}")
-            return {}
+            response = self.session.request(method, url, **kwargs)
+            self._failures = 0
+            return response
         except requests.exceptions.ConnectionError:
+            self._failures += 1
+            if self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+                self._open_until = time.monotonic() + CIRCUIT_OPEN_SECONDS
             st.error("Cannot connect to backend API. Is it running?")
+        except requests.exceptions.RequestException as e:
+            st.error(f"Unexpected error: {e}")
+        return None
+    
+    def _handle_response(self, response: Optional[requests.Response]) -> Dict[str, Any]:
+        """Handle API response and errors."""
+        # Error statuses are ordinary outcomes here, so branch on them
+        # rather than raising and catching HTTPError
+        if response is None:
+            return {}
+        if not response.ok:
+            st.error(f"API Error: {response.status_code} {response.reason} for url: {response.url}")
             return {}
-        except Exception as e:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
             st.error(f"Unexpected error: {e}")
             return {}
     
+    def _conditional_get(self, url: str, params: Dict[str, Any]) -> Any:
+        """
+        GET with If-None-Match, reusing the last body on 304 Not Modified.
+        
+        Only endpoints that send an ETag (the backend's cached ones) benefit;
+        for others this is a plain GET.
+        """
+        key = (url, tuple(sorted(params.items())))
+        headers = self._get_headers()
+        previous = self._etags.get(key)
+        if previous:
+            headers["If-None-Match"] = previous[0]
+        
+        response = self._request("GET", url, params=params, headers=headers)
+        if response is None:
+            return {}
+        if response.status_code == 304 and previous:
+            return previous[1]
+        
+        result = self._handle_response(response)
+        etag = response.headers.get("ETag")
+        if etag and result:
+            self._etags[key] = (etag, result)
+        return result
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get headers with auth token if available."""
         headers = {"Content-Type": "application/json"}
@@ -39,7 +124,8 @@ class APIClient:
 
     def login(self, email: str, password: str) -> Dict[str, Any]:
         """Authenticate user."""
-        response = self.session.post(
+        response = self._request(
+            "POST",
             f"{self.base_url}/auth/login",
             data={"username": email, "password": password},
             headers={"Content-Type": "application/x-www-form-urlencoded"}
@@ -48,15 +134,17 @@ class APIClient:
 
     def signup(self, email: str, password: str, full_name: str) -> Dict[str, Any]:
         """Register new user."""
-        response = self.session.post(
+        response = self._request(
+            "POST",
             f"{self.base_url}/auth/signup",
-            json={"email": email, "password": password, "full_name": full_name}
+            data=orjson.dumps({"email": email, "password": password, "full_name": full_name})
         )
         return self._handle_response(response)
 
     def get_me(self) -> Dict[str, Any]:
         """Get current user details."""
-        response = self.session.get(
+        response = self._request(
+            "GET",
             f"{self.base_url}/auth/me",
             headers=self._get_headers()
         )
@@ -65,13 +153,14 @@ class APIClient:
     @st.cache_data(ttl=300)
     def get_health(_self) -> Dict[str, Any]:
         """Check API health status."""
-        response = _self.session.get(f"{_self.base_url.replace('/api/v1', '')}/health")
+        response = _self._request("GET", f"{_self.root_url}/health")
         return _self._handle_response(response)
     
     @st.cache_data(ttl=60)
     def get_all_stocks(_self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all stocks with pagination."""
-        response = _self.session.get(
+        response = _self._request(
+            "GET",
             f"{_self.base_url}/stocks",
             params={"skip": skip, "limit": limit},
             headers=_self._get_headers()
@@ -82,20 +171,23 @@ class APIClient:
     @st.cache_data(ttl=60)
     def get_stock(_self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get detailed stock information."""
-        response = _self.session.get(
+        response = _self._request(
+            "GET",
             f"{_self.base_url}/stocks/{symbol}",
             headers=_self._get_headers()
         )
         return _self._handle_response(response)
     
+    @st.cache_data(ttl=120, show_spinner=False)
     def screen_stocks(_self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Screen stocks with filters."""
         # Remove None values
         clean_filters = {k: v for k, v in filters.items() if v is not None}
         
-        response = _self.session.post(
+        response = _self._request(
+            "POST",
             f"{_self.base_url}/screen",
-            json=clean_filters,
+            data=orjson.dumps(clean_filters),
             headers=_self._get_headers()
         )
         result = _self._handle_response(response)
@@ -104,18 +196,17 @@ class APIClient:
     @st.cache_data(ttl=60)
     def get_rankings(_self, ranking_type: str = "composite", limit: int = 10) -> List[Dict[str, Any]]:
         """Get stock rankings by type (composite, fundamental, sentiment)."""
-        response = _self.session.get(
+        result = _self._conditional_get(
             f"{_self.base_url}/screen/rankings/{ranking_type}",
-            params={"limit": limit},
-            headers=_self._get_headers()
+            params={"limit": limit}
         )
-        result = _self._handle_response(response)
         return result if isinstance(result, list) else []
 
     @st.cache_data(ttl=300)
     def get_stock_sentiment(_self, symbol: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent sentiment scores with news details."""
-        response = _self.session.get(
+        response = _self._request(
+            "GET",
             f"{_self.base_url}/stocks/{symbol}/sentiment",
             params={"limit": limit},
             headers=_self._get_headers()
@@ -124,7 +215,9 @@ class APIClient:
         return result if isinstance(result, list) else []
 
 
-# Singleton instance - NOT cached to handle session state correctly
+# Shared by every page, rerun and user: the client holds no per-user state
+# (the auth token is read from st.session_state on each request)
+@st.cache_resource
 def get_api_client() -> APIClient:
     """Get API client instance."""
     return APIClient()
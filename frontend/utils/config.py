@@ -39,13 +39,16 @@ SCORE_COLORS = {
     "poor": {"min": 0, "color": "#ef4444"},        # red
 }
 
+# (min, color) pairs above "poor", highest first, for get_score_color
+_SCORE_THRESHOLDS = tuple(
+    (level["min"], level["color"])
+    for name, level in sorted(SCORE_COLORS.items(), key=lambda item: -item[1]["min"])
+    if name != "poor"
+)
+
 def get_score_color(score: float) -> str:
     """Get color based on score value."""
-    if score >= SCORE_COLORS["excellent"]["min"]:
-        return SCORE_COLORS["excellent"]["color"]
-    elif score >= SCORE_COLORS["good"]["min"]:
-        return SCORE_COLORS["good"]["color"]
-    elif score >= SCORE_COLORS["fair"]["min"]:
-        return SCORE_COLORS["fair"]["color"]
-    else:
-        return SCORE_COLORS["poor"]["color"]
+    for min_score, color in _SCORE_THRESHOLDS:
+        if score >= min_score:
+            return color
+    return SCORE_COLORS["poor"]["color"]